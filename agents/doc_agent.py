@@ -1,21 +1,62 @@
 import os
+import sys
 import time
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import hashlib
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from pathlib import Path
 
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
 # Import project modules
 from crawlers.firecrawl_client import crawl_web
 from utils.logger import DocuScraperLogger
+from utils.parallel_downloader import download_documents_parallel
+from utils.clock import now_iso
 from config.document_classes import get_document_class, get_all_document_classes
 
 # Initialize logger
 logger = DocuScraperLogger("doc-agent")
 
+# Read/write size used when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Reasonable document size range; with STRICT_SIZE_BOUNDS, files outside it
+# are rejected before their contents are sniffed
+MIN_FILE_SIZE = 10 * 1024
+MAX_FILE_SIZE = 10 * 1024 * 1024
+STRICT_SIZE_BOUNDS = True
+
+# Process-wide record of downloaded URLs, shared across jobs. The Bloom
+# filter costs a few bits per URL; hits are confirmed against the file on
+# disk, so a false positive only costs a stat() before downloading anyway.
+if ScalableBloomFilter is not None:
+    _seen_urls = ScalableBloomFilter(initial_capacity=100000, error_rate=1e-3)
+else:
+    _seen_urls = set()
+_seen_urls_lock = threading.Lock()
+
+# Shared HTTP session for sequential downloads so repeated hosts reuse
+# pooled keep-alive connections instead of a new TCP+TLS handshake each.
+# requests.Session is safe to share across threads.
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
 class DocumentValidationError(Exception):
     """Exception raised when document validation fails"""
     pass
@@ -25,7 +66,9 @@ def run_agent(
     limit: int = 10,
     deep_validation: bool = False,
     parallel_downloads: bool = True,
-    max_workers: int = 5
+    max_workers: int = 5,
+    query: Optional[str] = None,
+    file_types: Optional[List[str]] = None
 ) -> List[Dict[str, Any]]:
     """
     Run document search agent to find documents of a specific class
@@ -36,6 +79,8 @@ def run_agent(
         deep_validation: Whether to perform deep validation on results
         parallel_downloads: Whether to download documents in parallel
         max_workers: Maximum number of parallel download workers
+        query: Additional search terms appended to each class query (optional)
+        file_types: File extensions to accept instead of the class defaults (optional)
         
     Returns:
         List of document objects
@@ -56,52 +101,69 @@ def run_agent(
         # Generate a default query
         search_queries = [f"{doc_class} document sample filetype:pdf"]
     
-    # Search for documents using each query
+    # Refine class queries with caller-supplied terms
+    if query:
+        search_queries = [f"{search_query} {query}" for search_query in search_queries]
+    
+    # Search for documents using each query, concurrently when there are several
+    search_queries_used = search_queries[:2]  # Limit to first 2 queries for efficiency
     all_results = []
-    for query in search_queries[:2]:  # Limit to first 2 queries for efficiency
-        logger.info(f"Searching with query: {query}")
-        try:
-            # Use FireCrawl to search for documents
-            search_results = crawl_web(
-                query=query, 
-                limit=limit // 2,
-                file_types=doc_class_config.get("file_types")
-            )
-            all_results.extend(search_results)
-        except Exception as e:
-            logger.error(f"Error searching with query '{query}': {str(e)}")
-    
-    # Add doc_class to all results
-    for result in all_results:
-        result["doc_class"] = doc_class
+    if len(search_queries_used) > 1:
+        with ThreadPoolExecutor(max_workers=len(search_queries_used)) as executor:
+            futures = [
+                executor.submit(_search_query, search_query, limit // 2)
+                for search_query in search_queries_used
+            ]
+            # Collect in query order so results stay deterministic
+            for future in futures:
+                all_results.extend(future.result())
+    else:
+        for search_query in search_queries_used:
+            all_results.extend(_search_query(search_query, limit // 2))
     
-    # Filter out duplicate URLs
+    # Filter out duplicate URLs and unsupported file types
+    file_exts = tuple(file_types or doc_class_config.get("file_types", [".pdf", ".docx"]))
     unique_results = []
     processed_urls = set()
+    processed_urls_add = processed_urls.add
     for result in all_results:
-        url = result.get("url", "")
-        if url and url not in processed_urls:
-            processed_urls.add(url)
-            
-            # Check if URL points to a document with supported file type
-            file_types = doc_class_config.get("file_types", [".pdf", ".docx"])
-            is_supported_file = any(url.lower().endswith(ext) for ext in file_types)
-            
-            if is_supported_file:
-                unique_results.append(result)
+        url = result.get("url")
+        if not url or url in processed_urls:
+            continue
+        processed_urls_add(url)
+        
+        # Check if URL points to a document with supported file type
+        if url.lower().endswith(file_exts):
+            result["doc_class"] = doc_class
+            unique_results.append(result)
+    
+    # Reuse documents already downloaded by earlier jobs
+    documents = []
+    pending_results = []
+    for result in unique_results:
+        document = _load_downloaded_document(result)
+        if document:
+            documents.append(document)
+        else:
+            pending_results.append(result)
+    
+    # Only reject oversized files up front when they would fail validation
+    max_file_size = MAX_FILE_SIZE if deep_validation and STRICT_SIZE_BOUNDS else None
     
     # Download documents (parallel or sequential)
-    if parallel_downloads and len(unique_results) > 1:
-        from utils.parallel_downloader import download_documents_parallel
-        documents = download_documents_parallel(
-            unique_results, 
-            max_workers=max_workers
+    if parallel_downloads and len(pending_results) > 1:
+        downloaded = download_documents_parallel(
+            pending_results, 
+            max_workers=max_workers,
+            max_file_size=max_file_size
         )
+        for document in downloaded:
+            _remember_url(document["url"])
+        documents.extend(downloaded)
     else:
         # Sequential download
-        documents = []
-        for result in unique_results:
-            document = download_document(result)
+        for result in pending_results:
+            document = download_document(result, max_file_size=max_file_size)
             if document:
                 documents.append(document)
     
@@ -135,19 +197,187 @@ def run_agent(
     duration_ms = int((time.time() - start_time) * 1000)
     logger.log_document_search(
         doc_class=doc_class,
-        query=", ".join(search_queries[:2]),
+        query=", ".join(search_queries_used),
         results_count=len(documents),
         duration_ms=duration_ms
     )
     
     return documents
 
-def download_document(search_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _search_query(search_query: str, limit: int) -> List[Dict[str, Any]]:
+    """
+    Run a single FireCrawl search, logging rather than raising on failure
+    
+    Args:
+        search_query: Search query string
+        limit: Maximum number of results to return
+        
+    Returns:
+        List of search result dictionaries (empty on error)
+    """
+    logger.info(f"Searching with query: {search_query}")
+    try:
+        # Use FireCrawl to search for documents
+        return crawl_web(query=search_query, limit=limit)
+    except Exception as e:
+        logger.error(f"Error searching with query '{search_query}': {str(e)}")
+        return []
+
+def _document_file_path(url: str, doc_class: str) -> Tuple[Path, str]:
+    """
+    Build the local storage path for a document URL, without touching disk
+    
+    Args:
+        url: Document URL
+        doc_class: Document class used as the storage sub-directory
+        
+    Returns:
+        Tuple of (file_path, file_extension)
+    """
+    # Non-cryptographic use: the hash only disambiguates file names
+    url_hash = hashlib.blake2b(url.encode("utf-8"), digest_size=10).hexdigest()
+    file_ext = os.path.splitext(url)[1].lower()
+    if not file_ext:
+        file_ext = ".pdf"  # Default to PDF if no extension
+    
+    return Path(f"data/raw_docs/{doc_class}") / f"{url_hash}{file_ext}", file_ext
+
+def _prepare_file_path(url: str, doc_class: str) -> Tuple[Path, str]:
+    """
+    Build the local storage path for a document URL and create its directory
+    
+    Args:
+        url: Document URL
+        doc_class: Document class used as the storage sub-directory
+        
+    Returns:
+        Tuple of (file_path, file_extension)
+    """
+    file_path, file_ext = _document_file_path(url, doc_class)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    return file_path, file_ext
+
+def _document_metadata(
+    url: str,
+    title: str,
+    doc_class: str,
+    file_path: Path,
+    file_ext: str,
+    file_size: int
+) -> Dict[str, Any]:
+    """Build the metadata dict describing a downloaded document"""
+    # doc_class and file_type repeat across nearly every document; interning
+    # shares one string object per distinct value
+    return {
+        "doc_class": sys.intern(doc_class),
+        "title": title,
+        "url": url,
+        "file_path": str(file_path),
+        "file_type": sys.intern(file_ext),
+        "file_size": file_size,
+        "timestamp": now_iso(),
+        "download_successful": True,
+        "validated": False
+    }
+
+def _remember_url(url: str) -> None:
+    """Record a successfully downloaded URL for cross-job deduplication"""
+    with _seen_urls_lock:
+        _seen_urls.add(url)
+
+def _load_downloaded_document(search_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Return metadata for a document downloaded by an earlier job
+    
+    Args:
+        search_result: Search result containing document URL
+        
+    Returns:
+        Document metadata if the URL was already downloaded and its file
+        still exists, None otherwise
+    """
+    url = search_result.get("url", "")
+    with _seen_urls_lock:
+        if not url or url not in _seen_urls:
+            return None
+    
+    doc_class = search_result.get("doc_class", "unknown")
+    file_path, file_ext = _document_file_path(url, doc_class)
+    try:
+        file_size = file_path.stat().st_size
+    except FileNotFoundError:
+        # Bloom filter false positive, or the file was removed since
+        return None
+    
+    logger.info(f"Reusing previously downloaded document: {url}")
+    return _document_metadata(
+        url, search_result.get("title", "Unknown Document"), doc_class,
+        file_path, file_ext, file_size
+    )
+
+def _check_headers(headers, file_ext: str, max_file_size: Optional[int] = None):
+    """
+    Reject a download from its response headers, before the body is read
+    
+    Args:
+        headers: Response headers
+        file_ext: File extension the document is expected to have
+        max_file_size: Maximum accepted Content-Length (optional)
+        
+    Raises:
+        ValueError: If the content type or length is unacceptable
+    """
+    is_acceptable, reason = check_response_headers(
+        headers.get("Content-Type"),
+        headers.get("Content-Length"),
+        file_ext,
+        max_file_size
+    )
+    if not is_acceptable:
+        raise ValueError(reason)
+
+def _write_stream(stream, file_path: Path) -> int:
+    """
+    Copy a readable binary stream to a file with unbuffered writes
+    
+    Chunks are large already, so they go straight to os.write instead of
+    being copied through Python's BufferedWriter first.
+    
+    Args:
+        stream: File-like object with a read(size) method
+        file_path: Destination path (created or truncated)
+        
+    Returns:
+        Number of bytes written
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(str(file_path), flags, 0o644)
+    total = 0
+    try:
+        while True:
+            chunk = stream.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            # os.write may write fewer bytes than requested
+            view = memoryview(chunk)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            total += len(chunk)
+    finally:
+        os.close(fd)
+    return total
+
+def download_document(
+    search_result: Dict[str, Any],
+    max_file_size: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
     """
     Download document from URL and save to local storage
     
     Args:
         search_result: Search result containing document URL
+        max_file_size: Reject downloads announcing a larger Content-Length (optional)
         
     Returns:
         Document metadata if download successful, None otherwise
@@ -164,37 +394,27 @@ def download_document(search_result: Dict[str, Any]) -> Optional[Dict[str, Any]]
     
     try:
         # Create file path from URL
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        file_ext = os.path.splitext(url)[1].lower()
-        if not file_ext:
-            file_ext = ".pdf"  # Default to PDF if no extension
-            
-        # Create directory structure
-        doc_dir = Path(f"data/raw_docs/{doc_class}")
-        doc_dir.mkdir(parents=True, exist_ok=True)
-        
-        file_path = doc_dir / f"{url_hash}{file_ext}"
+        file_path, file_ext = _prepare_file_path(url, doc_class)
         
         # Download the file
-        response = requests.get(url, stream=True, timeout=30)
+        response = _session.get(url, stream=True, timeout=30)
         response.raise_for_status()
+        try:
+            _check_headers(response.headers, file_ext, max_file_size)
+        except ValueError:
+            # Drop the connection rather than draining an unwanted body
+            response.close()
+            raise
         
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Let urllib3 undo any Content-Encoding while copying straight to disk
+        response.raw.decode_content = True
+        file_size = _write_stream(response.raw, file_path)
         
         # Create document metadata
-        document = {
-            "doc_class": doc_class,
-            "title": title,
-            "url": url,
-            "file_path": str(file_path),
-            "file_type": file_ext,
-            "file_size": os.path.getsize(file_path),
-            "timestamp": datetime.now().isoformat(),
-            "download_successful": True,
-            "validated": False
-        }
+        document = _document_metadata(
+            url, title, doc_class, file_path, file_ext, file_size
+        )
+        _remember_url(url)
         
         # Log successful download
         logger.log_document_download(
@@ -220,7 +440,9 @@ def download_document(search_result: Dict[str, Any]) -> Optional[Dict[str, Any]]
         return None
 
 # Add this import at the top
-from utils.file_validator import validate_file_type, get_expected_mime_types
+from utils.file_validator import (
+    validate_file_type, get_expected_mime_types, check_file_signature, check_response_headers
+)
 
 # Update the validate_document function
 def validate_document(
@@ -251,15 +473,25 @@ def validate_document(
         return False
     
     # Check if file size is reasonable (between 10KB and 10MB)
-    if file_size < 10 * 1024 or file_size > 10 * 1024 * 1024:
+    if file_size < MIN_FILE_SIZE or file_size > MAX_FILE_SIZE:
         logger.warning(f"Suspicious file size ({file_size} bytes): {file_path}")
-        # Don't reject based on size alone, just log a warning
+        if STRICT_SIZE_BOUNDS:
+            return False
     
-    # Validate file type using python-magic
+    # Cheap magic-bytes check before running the full libmagic sniff
     file_ext = document.get("file_type", "")
+    signature_ok = check_file_signature(file_path, file_ext)
+    if signature_ok is False:
+        logger.warning(f"File signature does not match {file_ext}: {file_path}")
+        return False
+    
+    # Validate file type using python-magic, skipped for trusted extensions
+    # whose signature already matched
     expected_mime_types = get_expected_mime_types(file_ext)
     
-    is_valid_type, detected_type = validate_file_type(file_path, expected_mime_types)
+    is_valid_type, detected_type = validate_file_type(
+        file_path, expected_mime_types, deep=signature_ok is not True
+    )
     if not is_valid_type:
         logger.warning(f"Invalid file type for {file_path}. Detected: {detected_type}")
         return False
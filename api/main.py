@@ -7,11 +7,23 @@ import sys
 import logging
 import uuid
 import json
+import mimetypes
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import shutil
 import subprocess
 import asyncio
+import functools
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from agents.doc_agent import run_agent
+from utils.clock import now_iso
+from api.store import DocuScraperStore
 
 # Configure logging
 logging.basicConfig(
@@ -99,10 +111,14 @@ class ReportResponse(BaseModel):
     download_url: str
     timestamp: str
 
-# In-memory storage for scraping jobs
-active_jobs = {}
-completed_jobs = {}
-downloaded_documents = {}
+# Run searches through the standalone scraper script instead of in-process
+USE_SCRAPER_SUBPROCESS = os.getenv("DOCUSCRAPER_USE_SUBPROCESS", "").lower() in ("1", "true", "yes")
+
+# File extensions picked up from a finished job's output directory
+SUPPORTED_EXTS = (".pdf", ".doc", ".docx", ".jpg", ".png")
+
+# Persistent storage for scraping jobs and downloaded documents
+store = DocuScraperStore(os.getenv("DOCUSCRAPER_DB", "data/docuscraper.db"))
 
 # Document class definitions - normally would be in a separate module
 DOCUMENT_CLASSES = {
@@ -143,11 +159,12 @@ DOCUMENT_CLASSES = {
 }
 
 def get_document_classes_by_category(category):
-    """Get document classes by category"""
+    """Get document classes by category (read-only view)"""
     if category in DOCUMENT_CLASSES:
-        return DOCUMENT_CLASSES[category]
-    return {}
+        return MappingProxyType(DOCUMENT_CLASSES[category])
+    return MappingProxyType({})
 
+@functools.lru_cache(maxsize=None)
 def get_all_document_classes():
     """Get all document classes"""
     all_classes = {}
@@ -155,6 +172,10 @@ def get_all_document_classes():
         all_classes.update(classes)
     return all_classes
 
+def guess_media_type(file_path):
+    """Guess a file's content type from its name, defaulting to binary"""
+    return mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+
 # Routes
 @app.get("/", tags=["General"])
 async def root():
@@ -172,10 +193,10 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy", 
-        "timestamp": datetime.now().isoformat(),
-        "active_jobs": len(active_jobs),
-        "completed_jobs": len(completed_jobs),
-        "documents_count": len(downloaded_documents)
+        "timestamp": now_iso(),
+        "active_jobs": store.count_jobs(completed=False),
+        "completed_jobs": store.count_jobs(completed=True),
+        "documents_count": store.count_documents()
     }
 
 @app.get("/document/classes", response_model=DocumentClassesResponse, tags=["Documents"])
@@ -211,105 +232,121 @@ async def get_document_classes():
     
     return response
 
+def iter_files(path):
+    """Recursively yield os.DirEntry objects for regular files under path"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+def run_scraper_subprocess(job_id, doc_class, limit, file_types=None, query=None):
+    """Run the standalone document scraper script and collect its output files"""
+    # Create output directory for this job
+    output_dir = f"data/downloads/{job_id}"
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Prepare search command
+    cmd = [
+        "python", "document_scraper.py",
+        "--output-dir", output_dir,
+        "--max-downloads", str(limit),
+        "--doc-class", doc_class
+    ]
+    
+    if file_types:
+        cmd.extend(["--file-types", ",".join(file_types)])
+        
+    if query:
+        cmd.extend(["--query", query])
+    
+    # Run the document scraper as a subprocess
+    logger.info(f"Starting document search job {job_id}: {' '.join(cmd)}")
+    process = subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    
+    # Wait for process to complete
+    stdout, stderr = process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr)
+    
+    # Scan output directory for downloaded files
+    downloaded_files = []
+    for entry in iter_files(output_dir):
+        if entry.name.lower().endswith(SUPPORTED_EXTS):
+            _, file_ext = os.path.splitext(entry.name)
+            downloaded_files.append({
+                "doc_class": doc_class,
+                "title": entry.name,
+                "file_path": entry.path,
+                "file_type": file_ext.lower(),
+                "file_size": entry.stat().st_size,
+                "timestamp": now_iso()
+            })
+    
+    return downloaded_files
+
 async def run_document_search(job_id, doc_class, limit, file_types=None, query=None):
     """Background task to run document search and download"""
     try:
         # Update job status
-        active_jobs[job_id]["status"] = "searching"
+        store.update_job(job_id, status="searching")
         
-        # Create output directory for this job
-        output_dir = f"data/downloads/{job_id}"
-        os.makedirs(output_dir, exist_ok=True)
+        # Run the search off the event loop, in-process unless the
+        # standalone scraper script was requested
+        loop = asyncio.get_running_loop()
+        if USE_SCRAPER_SUBPROCESS:
+            search = functools.partial(
+                run_scraper_subprocess, job_id, doc_class, limit,
+                file_types=file_types, query=query
+            )
+        else:
+            logger.info(f"Starting document search job {job_id} for class: {doc_class}")
+            search = functools.partial(
+                run_agent,
+                doc_class=doc_class,
+                limit=limit,
+                parallel_downloads=True,
+                query=query,
+                file_types=file_types
+            )
+        results = await loop.run_in_executor(None, search)
         
-        # Prepare search command
-        cmd = [
-            "python", "document_scraper.py",
-            "--output-dir", output_dir,
-            "--max-downloads", str(limit),
-            "--doc-class", doc_class
-        ]
+        # Create document metadata with a unique ID per document
+        downloaded_files = []
+        for result in results:
+            doc_id = str(uuid.uuid4())
+            downloaded_files.append({
+                "id": doc_id,
+                "doc_class": result["doc_class"],
+                "title": result["title"],
+                "file_path": result["file_path"],
+                "file_type": result["file_type"],
+                "file_size": result["file_size"],
+                "timestamp": result["timestamp"],
+                "download_url": f"/document/download/{doc_id}"
+            })
         
-        if file_types:
-            cmd.extend(["--file-types", ",".join(file_types)])
-            
-        if query:
-            cmd.extend(["--query", query])
+        store.add_documents(downloaded_files)
         
-        # Run the document scraper as a subprocess
-        logger.info(f"Starting document search job {job_id}: {' '.join(cmd)}")
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+        # Mark job completed with document info
+        store.update_job(
+            job_id,
+            status="completed",
+            completed=True,
+            documents_found=len(downloaded_files),
+            documents_downloaded=len(downloaded_files)
         )
         
-        # Wait for process to complete
-        stdout, stderr = process.communicate()
-        
-        # Update job status based on result
-        if process.returncode == 0:
-            # Job completed successfully
-            active_jobs[job_id]["status"] = "completed"
-            active_jobs[job_id]["completed"] = True
-            
-            # Scan output directory for downloaded files
-            downloaded_files = []
-            for root, _, files in os.walk(output_dir):
-                for file in files:
-                    if file.lower().endswith(tuple([".pdf", ".doc", ".docx", ".jpg", ".png"])):
-                        file_path = os.path.join(root, file)
-                        file_size = os.path.getsize(file_path)
-                        _, file_ext = os.path.splitext(file)
-                        
-                        # Generate a unique ID for this document
-                        doc_id = str(uuid.uuid4())
-                        
-                        # Create document metadata
-                        document = {
-                            "id": doc_id,
-                            "doc_class": doc_class,
-                            "title": file,
-                            "file_path": file_path,
-                            "file_type": file_ext.lower(),
-                            "file_size": file_size,
-                            "timestamp": datetime.now().isoformat(),
-                            "download_url": f"/document/download/{doc_id}"
-                        }
-                        
-                        downloaded_files.append(document)
-                        downloaded_documents[doc_id] = document
-            
-            # Update job with document info
-            active_jobs[job_id]["documents_found"] = len(downloaded_files)
-            active_jobs[job_id]["documents_downloaded"] = len(downloaded_files)
-            
-            # Move job to completed jobs
-            completed_jobs[job_id] = active_jobs[job_id]
-            del active_jobs[job_id]
-            
-            logger.info(f"Job {job_id} completed. Downloaded {len(downloaded_files)} documents.")
-        else:
-            # Job failed
-            active_jobs[job_id]["status"] = "failed"
-            active_jobs[job_id]["completed"] = True
-            active_jobs[job_id]["error"] = stderr
-            
-            # Move job to completed jobs
-            completed_jobs[job_id] = active_jobs[job_id]
-            del active_jobs[job_id]
-            
-            logger.error(f"Job {job_id} failed: {stderr}")
+        logger.info(f"Job {job_id} completed. Downloaded {len(downloaded_files)} documents.")
     except Exception as e:
         logger.error(f"Error in document search job {job_id}: {str(e)}")
-        active_jobs[job_id]["status"] = "failed"
-        active_jobs[job_id]["completed"] = True
-        active_jobs[job_id]["error"] = str(e)
-        
-        # Move job to completed jobs
-        completed_jobs[job_id] = active_jobs[job_id]
-        if job_id in active_jobs:
-            del active_jobs[job_id]
+        store.update_job(job_id, status="failed", completed=True, error=str(e))
 
 @app.post("/search", response_model=DocumentSearchResponse, tags=["Documents"])
 async def search_documents(request: DocumentSearchRequest, background_tasks: BackgroundTasks):
@@ -329,13 +366,13 @@ async def search_documents(request: DocumentSearchRequest, background_tasks: Bac
         "job_id": job_id,
         "doc_class": request.doc_class,
         "status": "queued",
-        "start_time": datetime.now().isoformat(),
+        "start_time": now_iso(),
         "estimated_completion": (datetime.now().timestamp() + 300),  # Estimate 5 minutes
         "completed": False
     }
     
     # Store job data
-    active_jobs[job_id] = job_data
+    store.create_job(job_data)
     
     # Start the search process in the background
     background_tasks.add_task(
@@ -352,13 +389,9 @@ async def search_documents(request: DocumentSearchRequest, background_tasks: Bac
 @app.get("/search/{job_id}", response_model=JobStatusResponse, tags=["Documents"])
 async def get_job_status(job_id: str):
     """Get the status of a document search job"""
-    # Check active jobs first
-    if job_id in active_jobs:
-        return active_jobs[job_id]
-    
-    # Then check completed jobs
-    if job_id in completed_jobs:
-        return completed_jobs[job_id]
+    job = store.get_job(job_id)
+    if job:
+        return job
     
     # Job not found
     raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
@@ -370,13 +403,8 @@ async def list_documents(
     offset: int = Query(0, description="Number of documents to skip")
 ):
     """List downloaded documents"""
-    # Filter documents by class if specified
-    filtered_docs = list(downloaded_documents.values())
-    if doc_class:
-        filtered_docs = [doc for doc in filtered_docs if doc["doc_class"] == doc_class]
-    
-    # Apply pagination
-    paginated_docs = filtered_docs[offset:offset+limit]
+    # Filter documents by class if specified and apply pagination
+    paginated_docs = store.list_documents(doc_class, limit=limit, offset=offset)
     
     # Format response
     response = []
@@ -396,14 +424,22 @@ async def list_documents(
 @app.get("/document/download/{doc_id}", tags=["Documents"])
 async def download_document(doc_id: str):
     """Download a specific document"""
-    if doc_id not in downloaded_documents:
+    document = store.get_document(doc_id)
+    if not document:
         raise HTTPException(status_code=404, detail=f"Document {doc_id} not found")
     
-    document = downloaded_documents[doc_id]
+    if not os.path.exists(document["file_path"]):
+        raise HTTPException(status_code=404, detail=f"File for document {doc_id} not found")
+    
+    # Titles come from search results and usually lack the file extension
+    filename = document["title"]
+    if not filename.lower().endswith(document["file_type"]):
+        filename += document["file_type"]
+    
     return FileResponse(
         path=document["file_path"],
-        filename=document["title"],
-        media_type="application/octet-stream"
+        filename=filename,
+        media_type=guess_media_type(document["file_path"])
     )
 
 @app.post("/report", response_model=ReportResponse, tags=["Reports"])
@@ -413,11 +449,7 @@ async def generate_document_report(request: ReportRequest):
     
     try:
         # Filter documents by class if specified
-        if request.doc_class:
-            filtered_docs = [doc for doc in downloaded_documents.values() 
-                           if doc["doc_class"] == request.doc_class]
-        else:
-            filtered_docs = list(downloaded_documents.values())
+        filtered_docs = store.list_documents(request.doc_class)
         
         if not filtered_docs:
             raise HTTPException(status_code=404, detail="No documents found")
@@ -428,15 +460,19 @@ async def generate_document_report(request: ReportRequest):
         report_path = os.path.join("data/reports", report_file)
         
         # Generate the report (simplified example - real implementation would create proper Excel/PDF)
-        with open(report_path, 'w') as f:
-            json.dump(filtered_docs, f, indent=2)
+        if orjson is not None:
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(filtered_docs, option=orjson.OPT_INDENT_2))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(filtered_docs, f, indent=2)
         
         return {
             "report_id": report_id,
             "doc_class": request.doc_class,
             "document_count": len(filtered_docs),
             "download_url": f"/report/download/{report_id}",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now_iso()
         }
         
     except Exception as e:
@@ -446,14 +482,15 @@ async def generate_document_report(request: ReportRequest):
 @app.get("/report/download/{report_id}", tags=["Reports"])
 async def download_report(report_id: str):
     """Download a generated report"""
-    # Search for report file
+    # Search for report file; reports are written as JSON whatever
+    # output_format they were requested in
     for ext in ["excel", "pdf", "json"]:
         report_path = os.path.join("data/reports", f"report_{report_id}.{ext}")
         if os.path.exists(report_path):
             return FileResponse(
                 path=report_path,
-                filename=f"document_report.{ext}",
-                media_type="application/octet-stream"
+                filename="document_report.json",
+                media_type="application/json"
             )
     
     raise HTTPException(status_code=404, detail=f"Report {report_id} not found")
@@ -462,18 +499,20 @@ async def download_report(report_id: str):
 @app.delete("/document/{doc_id}", tags=["Documents"])
 async def delete_document(doc_id: str):
     """Delete a specific document"""
-    if doc_id not in downloaded_documents:
+    document = store.get_document(doc_id)
+    if not document:
         raise HTTPException(status_code=404, detail=f"Document {doc_id} not found")
     
-    document = downloaded_documents[doc_id]
     
     try:
-        # Delete the file
-        if os.path.exists(document["file_path"]):
-            os.remove(document["file_path"])
+        # Remove from document store
+        store.delete_document(doc_id)
         
-        # Remove from document list
-        del downloaded_documents[doc_id]
+        # Delete the file unless another document (e.g. from another job
+        # that fetched the same URL) still points at it
+        file_path = document["file_path"]
+        if not store.file_path_in_use(file_path) and os.path.exists(file_path):
+            os.remove(file_path)
         
         return {"status": "success", "message": f"Document {doc_id} deleted"}
     except Exception as e:
@@ -482,4 +521,10 @@ async def delete_document(doc_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "api.main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools"
+    )
\ No newline at end of file
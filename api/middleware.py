@@ -1,37 +1,47 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from utils.logger import DocuScraperLogger
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """Middleware for logging API requests"""
-    
+
     def __init__(self, app: ASGIApp):
         """Initialize middleware"""
-        super().__init__(app)
+        self.app = app
         self.logger = DocuScraperLogger("api-requests")
-    
-    async def dispatch(self, request: Request, call_next):
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
         """Process request and log details"""
-        start_time = time.time()
-        
-        # Get client IP
-        client_ip = request.client.host if request.client else None
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration_ms = int((time.time() - start_time) * 1000)
-        
-        # Log request
-        self.logger.log_api_request(
-            endpoint=request.url.path,
-            method=request.method,
-            status_code=response.status_code,
-            duration_ms=duration_ms,
-            client_ip=client_ip
-        )
-        
-        return response
\ No newline at end of file
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic_ns()
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            """Capture the response status code as it is sent"""
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            # Process request
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Calculate duration
+            duration_ms = (time.monotonic_ns() - start_time) // 1_000_000
+
+            # Get client IP
+            client = scope.get("client")
+            client_ip = client[0] if client else None
+
+            # Log request
+            self.logger.log_api_request(
+                endpoint=scope["path"],
+                method=scope["method"],
+                status_code=status_code,
+                duration_ms=duration_ms,
+                client_ip=client_ip
+            )
@@ -0,0 +1,204 @@
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional
+
+# Columns persisted for each scraping job
+JOB_FIELDS = (
+    "job_id", "doc_class", "status", "start_time", "estimated_completion",
+    "completed", "error", "documents_found", "documents_downloaded"
+)
+
+# Columns persisted for each downloaded document
+DOCUMENT_FIELDS = (
+    "id", "doc_class", "title", "file_path", "file_type", "file_size", "timestamp"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    doc_class TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    estimated_completion REAL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    documents_found INTEGER,
+    documents_downloaded INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_completed ON jobs (completed);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id TEXT PRIMARY KEY,
+    doc_class TEXT NOT NULL,
+    title TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    file_size INTEGER NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_doc_class ON documents (doc_class);
+CREATE INDEX IF NOT EXISTS idx_documents_file_path ON documents (file_path);
+"""
+
+class DocuScraperStore:
+    """
+    SQLite-backed storage for scraping jobs and downloaded documents
+
+    Features:
+    - Survives API restarts when backed by a file (WAL journal); jobs left
+      running by a previous process are marked failed on open
+    - Indexed lookups of documents by class
+    """
+
+    def __init__(self, db_path: str = "data/docuscraper.db"):
+        """Open the database and create tables if needed"""
+        self.db_path = db_path
+
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+
+        # A single connection shared by request handlers and background
+        # tasks; access is serialized with a lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock:
+            if db_path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+        # Background tasks don't survive a restart; close out the jobs they
+        # were running so they stop counting as active
+        self._execute(
+            "UPDATE jobs SET status = 'failed', completed = 1, error = 'interrupted' "
+            "WHERE completed = 0"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Execute a single statement inside its own transaction"""
+        with self._lock, self._conn:
+            return self._conn.execute(sql, params)
+
+    def _fetchall(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        """Run a query and return all rows"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Row]:
+        """Run a query and return the first row"""
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a jobs row into the job dict returned by the API"""
+        job = dict(row)
+        job["completed"] = bool(job["completed"])
+        return job
+
+    @staticmethod
+    def _document_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convert a documents row into the document dict returned by the API"""
+        document = dict(row)
+        document["download_url"] = f"/document/download/{document['id']}"
+        return document
+
+    # Jobs
+
+    def create_job(self, job: Dict[str, Any]):
+        """Insert a new scraping job"""
+        values = tuple(job.get(field) for field in JOB_FIELDS)
+        placeholders = ", ".join("?" for _ in JOB_FIELDS)
+        self._execute(
+            f"INSERT INTO jobs ({', '.join(JOB_FIELDS)}) VALUES ({placeholders})",
+            values
+        )
+
+    def update_job(self, job_id: str, **fields: Any):
+        """Update selected fields of a scraping job"""
+        unknown = set(fields) - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(sorted(unknown))}")
+
+        assignments = ", ".join(f"{field} = ?" for field in fields)
+        self._execute(
+            f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+            tuple(fields.values()) + (job_id,)
+        )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a scraping job by ID"""
+        row = self._fetchone("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return self._job_from_row(row) if row else None
+
+    def count_jobs(self, completed: bool) -> int:
+        """Count active or completed scraping jobs"""
+        row = self._fetchone(
+            "SELECT COUNT(*) FROM jobs WHERE completed = ?", (int(completed),)
+        )
+        return row[0]
+
+    # Documents
+
+    def add_documents(self, documents: List[Dict[str, Any]]):
+        """Insert downloaded documents in a single transaction"""
+        placeholders = ", ".join("?" for _ in DOCUMENT_FIELDS)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT INTO documents ({', '.join(DOCUMENT_FIELDS)}) VALUES ({placeholders})",
+                [tuple(doc.get(field) for field in DOCUMENT_FIELDS) for doc in documents]
+            )
+
+    def get_document(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """Get a downloaded document by ID"""
+        row = self._fetchone("SELECT * FROM documents WHERE id = ?", (doc_id,))
+        return self._document_from_row(row) if row else None
+
+    def list_documents(
+        self,
+        doc_class: Optional[str] = None,
+        limit: int = -1,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        List downloaded documents in insertion order
+
+        Args:
+            doc_class: Filter by document class (optional)
+            limit: Maximum number of documents to return (-1 for no limit)
+            offset: Number of documents to skip
+
+        Returns:
+            List of document dicts
+        """
+        if doc_class:
+            rows = self._fetchall(
+                "SELECT * FROM documents WHERE doc_class = ? ORDER BY rowid LIMIT ? OFFSET ?",
+                (doc_class, limit, offset)
+            )
+        else:
+            rows = self._fetchall(
+                "SELECT * FROM documents ORDER BY rowid LIMIT ? OFFSET ?", (limit, offset)
+            )
+        return [self._document_from_row(row) for row in rows]
+
+    def count_documents(self) -> int:
+        """Count downloaded documents"""
+        return self._fetchone("SELECT COUNT(*) FROM documents")[0]
+
+    def delete_document(self, doc_id: str):
+        """Delete a downloaded document record"""
+        self._execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def file_path_in_use(self, file_path: str) -> bool:
+        """Check whether any document record points at a file"""
+        row = self._fetchone("SELECT 1 FROM documents WHERE file_path = ? LIMIT 1", (file_path,))
+        return row is not None
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
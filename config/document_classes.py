@@ -2,6 +2,9 @@
 Configuration for document classes and their search parameters
 """
 
+import functools
+from types import MappingProxyType
+
 DOCUMENT_CLASSES = {
     # Company Documents
     "commercial_register": {
@@ -102,6 +105,13 @@ DOCUMENT_CLASSES = {
     }
 }
 
+# Document classes grouped by category, built once at import time
+_BY_CATEGORY = {}
+for _class_id, _class_config in DOCUMENT_CLASSES.items():
+    _BY_CATEGORY.setdefault(_class_config["category"], {})[_class_id] = _class_config
+
+# Bounded: IDs come from callers and may be arbitrary strings
+@functools.lru_cache(maxsize=64)
 def get_document_class(doc_class_id):
     """Get document class configuration by ID"""
     return DOCUMENT_CLASSES.get(doc_class_id.lower().replace(" ", "_"))
@@ -111,5 +121,5 @@ def get_all_document_classes():
     return DOCUMENT_CLASSES
 
 def get_document_classes_by_category(category):
-    """Get document classes by category (company or individual)"""
-    return {k: v for k, v in DOCUMENT_CLASSES.items() if v["category"] == category}
\ No newline at end of file
+    """Get document classes by category (company or individual, read-only view)"""
+    return MappingProxyType(_BY_CATEGORY.get(category, {}))
\ No newline at end of file
@@ -1,6 +1,10 @@
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
@@ -11,6 +15,114 @@ load_dotenv()
 API_KEY = os.getenv("FIRECRAWL_API_KEY")
 BASE_URL = "https://api.firecrawl.dev/search"
 
+# Shared session so repeated searches reuse pooled keep-alive connections
+# instead of a new TCP+TLS handshake per query. Retries are handled by
+# crawl_web itself.
+_SESSION = requests.Session()
+if API_KEY:
+    _SESSION.headers.update({"Authorization": f"Bearer {API_KEY}"})
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=32, max_retries=0))
+
+# Retry policy: only transient failures are retried, with full-jitter
+# exponential backoff capped at MAX_BACKOFF seconds
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Non-retryable statuses that still count against the circuit breaker: a bad
+# or revoked API key fails every call the same way
+BREAKER_FAILURE_STATUS_CODES = {401, 403}
+MAX_BACKOFF = 30
+
+def close():
+    """Close the shared HTTP session and its pooled connections"""
+    _SESSION.close()
+
+class _Breaker:
+    """
+    Process-wide circuit breaker for the FireCrawl API
+    
+    CLOSED: calls go through. After failure_threshold failed calls within
+    failure_window seconds the breaker OPENs and calls are rejected for
+    cooldown seconds. It then goes HALF_OPEN and lets a single trial call
+    through: success closes the breaker, failure reopens it.
+    
+    Calls rejected for request-specific reasons count as neither success
+    nor failure.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, failure_window: float = 30.0, cooldown: float = 30.0):
+        """Initialize breaker in the CLOSED state"""
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.cooldown = cooldown
+        self.fail_count = 0
+        self.first_failure_at = 0.0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Check whether a call may proceed"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self.trial_in_flight:
+                return False
+            # Cool-off elapsed: HALF_OPEN, let one trial call through
+            self.trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        """Record a successful call and close the breaker"""
+        with self._lock:
+            self.fail_count = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+    
+    def record_failure(self):
+        """Record a failed call, opening the breaker if failures pile up"""
+        with self._lock:
+            now = time.monotonic()
+            if self.trial_in_flight:
+                # HALF_OPEN trial failed: start another cool-off
+                self.trial_in_flight = False
+                self.opened_at = now
+                return
+            
+            if now - self.first_failure_at > self.failure_window:
+                self.fail_count = 0
+                self.first_failure_at = now
+            self.fail_count += 1
+            if self.fail_count >= self.failure_threshold:
+                self.opened_at = now
+    
+    def record_ignored(self):
+        """Record a call that says nothing about upstream health"""
+        with self._lock:
+            # Free the HALF_OPEN trial slot so another call can probe
+            self.trial_in_flight = False
+
+_breaker = _Breaker()
+
+def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+    """Get the server-requested retry delay in seconds from a Retry-After header"""
+    if response is None:
+        return None
+    
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
 def crawl_web(query: str, limit: int = 5, retries: int = 3, delay: int = 2) -> List[Dict[str, Any]]:
     """
     Search the web using FireCrawl API and return results.
@@ -19,7 +131,7 @@ def crawl_web(query: str, limit: int = 5, retries: int = 3, delay: int = 2) -> L
         query: Search query string
         limit: Maximum number of results to return
         retries: Number of retry attempts if request fails
-        delay: Delay between retries in seconds
+        delay: Base delay for exponential backoff between retries in seconds
         
     Returns:
         List of search result dictionaries
@@ -28,28 +140,58 @@ def crawl_web(query: str, limit: int = 5, retries: int = 3, delay: int = 2) -> L
         print("[ERROR] FIRECRAWL_API_KEY not found in environment variables")
         return []
         
-    headers = {"Authorization": f"Bearer {API_KEY}"}
     params = {"query": query, "limit": limit}
     
-    for attempt in range(retries):
-        try:
-            print(f"[REQUEST] Sending query: {query}")
-            response = requests.get(BASE_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+    # Fail fast while the upstream API is known to be down
+    if not _breaker.allow_request():
+        print(f"[ERROR] FireCrawl circuit breaker open, skipping query: {query}")
+        return []
+    
+    # All retries for this query count as one call for the circuit breaker:
+    # True on success, False on failure, None if it doesn't count either way
+    succeeded: Optional[bool] = False
+    try:
+        for attempt in range(retries):
+            try:
+                print(f"[REQUEST] Sending query: {query}")
+                response = _SESSION.get(BASE_URL, params=params, timeout=30)
+                response.raise_for_status()
             
-            results = response.json().get("results", [])
-            print(f"[SUCCESS] Retrieved {len(results)} results for query: {query}")
-            return results
+                results = response.json().get("results", [])
+                print(f"[SUCCESS] Retrieved {len(results)} results for query: {query}")
+                succeeded = True
+                return results
             
-        except requests.exceptions.RequestException as e:
-            if attempt < retries - 1:
-                print(f"[WARNING] Request failed (attempt {attempt+1}/{retries}): {e}")
-                time.sleep(delay)
-            else:
-                print(f"[ERROR] FireCrawl request failed after {retries} attempts: {e}")
-                return []
-        except Exception as e:
-            print(f"[ERROR] Unexpected error in FireCrawl request: {e}")
-            return []
+            except requests.exceptions.RequestException as e:
+                # Client errors will fail the same way again, so don't retry them
+                response = e.response
+                status_code = response.status_code if response is not None else None
+                if status_code is not None and status_code not in RETRYABLE_STATUS_CODES:
+                    print(f"[ERROR] FireCrawl request rejected with status {status_code}: {e}")
+                    if status_code not in BREAKER_FAILURE_STATUS_CODES:
+                        succeeded = None
+                    return []
             
-    return []
\ No newline at end of file
+                if attempt < retries - 1:
+                    # Honor Retry-After if given, otherwise back off with full jitter
+                    backoff = _retry_after(response)
+                    if backoff is None:
+                        backoff = random.uniform(0, delay * (2 ** attempt))
+                    backoff = min(backoff, MAX_BACKOFF)
+                    print(f"[WARNING] Request failed (attempt {attempt+1}/{retries}), retrying in {backoff:.1f}s: {e}")
+                    time.sleep(backoff)
+                else:
+                    print(f"[ERROR] FireCrawl request failed after {retries} attempts: {e}")
+                    return []
+            except Exception as e:
+                print(f"[ERROR] Unexpected error in FireCrawl request: {e}")
+                return []
+                
+        return []
+    finally:
+        if succeeded is None:
+            _breaker.record_ignored()
+        elif succeeded:
+            _breaker.record_success()
+        else:
+            _breaker.record_failure()
@@ -0,0 +1,102 @@
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents import doc_agent
+
+PDF_BODY = b"%PDF-1.4\n" + b"x" * 20000
+
+class _PdfHandler(BaseHTTPRequestHandler):
+    """Serve the same PDF for every path, counting requests per path"""
+
+    def do_GET(self):
+        """Send the PDF body"""
+        self.server.hits[self.path] += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(PDF_BODY)))
+        self.end_headers()
+        self.wfile.write(PDF_BODY)
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+
+class TestCrossJobReuse(unittest.TestCase):
+    """Test cases for reusing documents downloaded by earlier jobs"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local HTTP server"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _PdfHandler)
+        cls.server.hits = Counter()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local HTTP server"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Run in a temporary directory, since downloads go under data/"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+        self.server.hits.clear()
+
+    def search_results(self, *names):
+        """Patch the FireCrawl search to return URLs on the local server"""
+        results = [{"url": f"{self.base_url}/{self.id()}/{name}", "title": name} for name in names]
+        patcher = mock.patch.object(doc_agent, "crawl_web", lambda query, limit: list(results))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return [result["url"] for result in results]
+
+    def test_second_job_reuses_downloads(self):
+        """Test that a later job reuses files instead of downloading again"""
+        self.search_results("a.pdf", "b.pdf")
+
+        first = doc_agent.run_agent("passport", limit=10)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(sum(self.server.hits.values()), 2)
+
+        second = doc_agent.run_agent("passport", limit=10)
+        self.assertEqual(sum(self.server.hits.values()), 2)
+        self.assertEqual(
+            sorted((doc["url"], doc["file_path"], doc["file_size"]) for doc in second),
+            sorted((doc["url"], doc["file_path"], doc["file_size"]) for doc in first)
+        )
+
+    def test_missing_file_is_downloaded_again(self):
+        """Test that a remembered URL whose file is gone is fetched again"""
+        self.search_results("a.pdf")
+        first = doc_agent.run_agent("passport", limit=10, parallel_downloads=False)
+        os.remove(first[0]["file_path"])
+
+        second = doc_agent.run_agent("passport", limit=10, parallel_downloads=False)
+        self.assertEqual(sum(self.server.hits.values()), 2)
+        self.assertTrue(os.path.exists(second[0]["file_path"]))
+        self.assertEqual(second[0]["file_size"], len(PDF_BODY))
+
+    def test_reuse_check_creates_no_directories(self):
+        """Test that checking a remembered URL only stats the file"""
+        url = f"{self.base_url}/{self.id()}/a.pdf"
+        doc_agent._remember_url(url)
+
+        document = doc_agent._load_downloaded_document({"url": url, "doc_class": "passport"})
+        self.assertIsNone(document)
+        self.assertFalse(os.path.exists("data"))
+
+if __name__ == "__main__":
+    unittest.main()
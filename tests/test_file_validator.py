@@ -0,0 +1,93 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_validator import check_file_signature, check_response_headers
+
+class TestCheckResponseHeaders(unittest.TestCase):
+    """Test cases for the download response header prefilter"""
+
+    def test_accepts_expected_type(self):
+        """Test that the expected content type is accepted"""
+        self.assertEqual(check_response_headers("application/pdf", "1024", ".pdf"), (True, ""))
+
+    def test_accepts_type_with_parameters(self):
+        """Test that content type parameters and case are ignored"""
+        ok, _ = check_response_headers("Application/PDF; charset=binary", None, ".pdf")
+        self.assertTrue(ok)
+
+    def test_accepts_generic_types(self):
+        """Test that missing or generic content types are accepted"""
+        for content_type in (None, "", "application/octet-stream"):
+            ok, _ = check_response_headers(content_type, None, ".pdf")
+            self.assertTrue(ok, content_type)
+
+    def test_accepts_common_aliases(self):
+        """Test that non-standard types servers commonly send are accepted"""
+        for content_type, file_ext in (
+            ("application/x-pdf", ".pdf"),
+            ("application/zip", ".docx"),
+            ("application/vnd.ms-word", ".doc"),
+            ("image/jpg", ".jpg"),
+            ("image/pjpeg", ".JPG")
+        ):
+            ok, reason = check_response_headers(content_type, None, file_ext)
+            self.assertTrue(ok, f"{content_type} for {file_ext}: {reason}")
+
+    def test_rejects_error_pages(self):
+        """Test that HTML and JSON responses are rejected for any extension"""
+        for content_type in ("text/html; charset=utf-8", "application/json"):
+            ok, reason = check_response_headers(content_type, None, ".pdf")
+            self.assertFalse(ok)
+            self.assertIn("Unexpected content type", reason)
+
+    def test_rejects_mismatched_type(self):
+        """Test that a different document type is rejected"""
+        ok, reason = check_response_headers("image/png", None, ".pdf")
+        self.assertFalse(ok)
+        self.assertIn(".pdf", reason)
+
+    def test_size_limit(self):
+        """Test that Content-Length is only checked against a given limit"""
+        ok, reason = check_response_headers("application/pdf", "2048", ".pdf", max_size=1024)
+        self.assertFalse(ok)
+        self.assertIn("too large", reason)
+
+        self.assertTrue(check_response_headers("application/pdf", "2048", ".pdf")[0])
+        self.assertTrue(check_response_headers("application/pdf", "bogus", ".pdf", max_size=1024)[0])
+
+class TestCheckFileSignature(unittest.TestCase):
+    """Test cases for the magic-number file check"""
+
+    def setUp(self):
+        """Create a temporary directory for sample files"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def write(self, name, content):
+        """Write a sample file and return its path"""
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_matching_signature(self):
+        """Test files whose leading bytes match their extension"""
+        self.assertTrue(check_file_signature(self.write("a.pdf", b"%PDF-1.7\n"), ".pdf"))
+        self.assertTrue(check_file_signature(self.write("a.png", b"\x89PNG\r\n\x1a\n\x00"), ".PNG"))
+
+    def test_mismatched_signature(self):
+        """Test an HTML page saved under a document extension"""
+        path = self.write("a.pdf", b"<!DOCTYPE html><html></html>")
+        self.assertFalse(check_file_signature(path, ".pdf"))
+
+    def test_unknown_extension(self):
+        """Test that extensions without a known signature return None"""
+        self.assertIsNone(check_file_signature(self.write("a.txt", b"hello"), ".txt"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawlers import firecrawl_client
+from crawlers.firecrawl_client import _Breaker
+
+class TestBreaker(unittest.TestCase):
+    """Test cases for the FireCrawl circuit breaker state transitions"""
+
+    def setUp(self):
+        """Create a breaker on a controllable clock"""
+        self.now = 1000.0
+        patcher = mock.patch.object(firecrawl_client.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = _Breaker(failure_threshold=3, failure_window=30.0, cooldown=30.0)
+
+    def trip(self):
+        """Record enough failures to open the breaker"""
+        for _ in range(self.breaker.failure_threshold):
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """Test that the breaker opens once failures reach the threshold"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_failures_outside_window_do_not_open(self):
+        """Test that failures spread beyond the window reset the count"""
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.now += 31
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_half_open_allows_single_trial(self):
+        """Test that one trial call is let through after the cooldown"""
+        self.trip()
+        self.now += 29
+        self.assertFalse(self.breaker.allow_request())
+
+        self.now += 2
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_trial_success_closes(self):
+        """Test that a successful trial closes the breaker"""
+        self.trip()
+        self.now += 31
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_success()
+        self.assertTrue(self.breaker.allow_request())
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_trial_failure_reopens(self):
+        """Test that a failed trial starts another cooldown"""
+        self.trip()
+        self.now += 31
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow_request())
+        self.now += 31
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_ignored_trial_frees_slot(self):
+        """Test that an ignored trial lets another call probe"""
+        self.trip()
+        self.now += 31
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_ignored()
+        self.assertTrue(self.breaker.allow_request())
+
+if __name__ == "__main__":
+    unittest.main()
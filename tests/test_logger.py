@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import logging
+import tempfile
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import logger as logger_module
+from utils.logger import DocuScraperLogger
+
+class TestDocuScraperLogger(unittest.TestCase):
+    """Test cases for queued, rotating file logging"""
+
+    def setUp(self):
+        """Log into a temporary directory under a per-test logger name"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.log_dir = tmp_dir.name
+        self.name = f"test-logger-{self._testMethodName}"
+        self.addCleanup(self.flush)
+
+    def flush(self):
+        """Stop this test's listener, writing out all queued records"""
+        listener = logger_module._listeners.pop(self.name, None)
+        if listener is not None:
+            listener.stop()
+
+    def read_lines(self):
+        """Read the JSON lines of this test's log file"""
+        self.flush()
+        with open(os.path.join(self.log_dir, f"{self.name}.log"), encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_records_written_by_listener(self):
+        """Test that queued records reach the file as JSON with extra fields"""
+        logger = DocuScraperLogger(self.name, log_dir=self.log_dir, console_level=logging.CRITICAL)
+        logger.debug("debug message")
+        logger.log_document_download("https://example.com/a.pdf", "data/a.pdf", True)
+
+        lines = self.read_lines()
+        self.assertEqual([line["level"] for line in lines], ["DEBUG", "INFO"])
+        self.assertEqual(lines[1]["message"], "Document downloaded: data/a.pdf")
+        self.assertEqual(lines[1]["operation"], "document_download")
+        self.assertEqual(lines[1]["url"], "https://example.com/a.pdf")
+        self.assertIs(lines[1]["success"], True)
+        self.assertRegex(lines[1]["timestamp"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{3}Z$")
+
+    def test_same_name_shares_listener(self):
+        """Test that re-creating a logger does not duplicate records"""
+        DocuScraperLogger(self.name, log_dir=self.log_dir, console_level=logging.CRITICAL)
+        logger = DocuScraperLogger(self.name, log_dir=self.log_dir, console_level=logging.CRITICAL)
+        logger.info("once")
+
+        self.assertEqual([line["message"] for line in self.read_lines()], ["once"])
+
+    def test_file_rotation(self):
+        """Test that the log file rotates once it reaches the size limit"""
+        with mock.patch.object(logger_module, "LOG_MAX_BYTES", 500):
+            logger = DocuScraperLogger(self.name, log_dir=self.log_dir, console_level=logging.CRITICAL)
+        for i in range(20):
+            logger.info(f"message {i}")
+        self.flush()
+
+        log_file = os.path.join(self.log_dir, f"{self.name}.log")
+        self.assertTrue(os.path.exists(f"{log_file}.1"))
+        self.assertLessEqual(os.path.getsize(log_file), 500)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import hashlib
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.parallel_downloader import download_documents_parallel
+
+PDF_BODY = b"%PDF-1.4\n" + b"x" * 300000
+
+# Path -> (status, content type, body)
+ROUTES = {
+    "/doc.pdf": (200, "application/pdf", PDF_BODY),
+    "/alias.pdf": (200, "application/x-pdf", PDF_BODY),
+    "/error.pdf": (200, "text/html; charset=utf-8", b"<html>Not found</html>"),
+    "/missing.pdf": (404, "text/plain", b"Not found")
+}
+
+class _RouteHandler(BaseHTTPRequestHandler):
+    """Serve the fixed ROUTES table"""
+
+    def do_GET(self):
+        """Send the routed response"""
+        status, content_type, body = ROUTES[self.path]
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep test output quiet"""
+
+class TestParallelDownloader(unittest.TestCase):
+    """Test cases for the aiohttp download pipeline"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start a local HTTP server"""
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _RouteHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the local HTTP server"""
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """Run in a temporary directory, since downloads go under data/"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(tmp_dir.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def download(self, *paths, **kwargs):
+        """Download local server paths, returning documents keyed by path"""
+        results = [{"url": f"{self.base_url}{path}", "doc_class": "passport"} for path in paths]
+        documents = download_documents_parallel(results, max_workers=2, **kwargs)
+        return {document["url"][len(self.base_url):]: document for document in documents}
+
+    def test_download_metadata(self):
+        """Test the file and metadata written for a successful download"""
+        document = self.download("/doc.pdf")["/doc.pdf"]
+
+        with open(document["file_path"], "rb") as f:
+            self.assertEqual(f.read(), PDF_BODY)
+        self.assertTrue(document["file_path"].startswith(os.path.join("data", "raw_docs", "passport")))
+        self.assertEqual(document["file_type"], ".pdf")
+        self.assertEqual(document["file_size"], len(PDF_BODY))
+        self.assertEqual(document["content_hash"], hashlib.blake2b(PDF_BODY, digest_size=16).hexdigest())
+        self.assertEqual(document["mime_type"], "application/pdf")
+        self.assertRegex(document["timestamp"], r"^\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d$")
+        self.assertTrue(document["download_successful"])
+
+    def test_rejected_responses(self):
+        """Test that error statuses and error pages are dropped before the body"""
+        documents = self.download("/doc.pdf", "/error.pdf", "/missing.pdf")
+        self.assertEqual(set(documents), {"/doc.pdf"})
+
+        # Only the accepted download reached the disk
+        self.assertEqual(len(os.listdir(os.path.join("data", "raw_docs", "passport"))), 1)
+
+    def test_content_type_alias(self):
+        """Test that a common non-standard content type is accepted"""
+        self.assertIn("/alias.pdf", self.download("/alias.pdf"))
+
+    def test_size_limit(self):
+        """Test that Content-Length is checked only when a limit is given"""
+        self.assertEqual(self.download("/doc.pdf", max_file_size=1024), {})
+        self.assertIn("/doc.pdf", self.download("/doc.pdf"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+from openpyxl import load_workbook
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.report_generator import (
+    REPORT_COLUMNS, _report_row, generate_excel_report, generate_excel_report_fast
+)
+
+DOCUMENTS = [
+    {
+        "doc_class": "passport",
+        "title": "Passport & <scan>",
+        "url": "https://example.com/a.pdf",
+        "file_path": "downloads/a.pdf",
+        "file_type": ".pdf",
+        "file_size": 2048,
+        "download_successful": True,
+        "validated": True,
+        "timestamp": "20240101_120000"
+    },
+    # Missing and None fields fall back to the report defaults
+    {"title": None, "file_size": None, "url": "https://example.com/b"},
+    {"doc_class": "passport", "file_size": "512", "validated": None}
+]
+
+class TestExcelReport(unittest.TestCase):
+    """Test cases for the Excel report writers"""
+
+    def setUp(self):
+        """Create a temporary directory for reports"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.rows = [_report_row(doc) for doc in DOCUMENTS]
+
+    def read_back(self, path):
+        """Read all sheet rows of a workbook"""
+        workbook = load_workbook(path)
+        try:
+            return list(workbook.active.iter_rows(values_only=True))
+        finally:
+            workbook.close()
+
+    def test_fast_report_contents(self):
+        """Test the directly written XLSX read back with openpyxl"""
+        path = generate_excel_report_fast(self.rows, os.path.join(self.tmp_dir.name, "fast.xlsx"))
+        sheet_rows = self.read_back(path)
+
+        self.assertEqual(sheet_rows[0], REPORT_COLUMNS)
+        self.assertEqual(sheet_rows[1], (
+            "passport", "Passport & <scan>", "https://example.com/a.pdf", "downloads/a.pdf",
+            ".pdf", 2048, True, True, "20240101_120000"
+        ))
+        self.assertEqual(sheet_rows[2], (
+            "Unknown", "Untitled", "https://example.com/b", None, None, 0, False, False, None
+        ))
+        self.assertEqual(sheet_rows[3][5], 512)
+        self.assertIs(sheet_rows[3][7], False)
+
+    def test_fast_report_matches_pandas_report(self):
+        """Test that both Excel writers produce the same cells"""
+        fast_path = generate_excel_report_fast(self.rows, os.path.join(self.tmp_dir.name, "fast.xlsx"))
+        pandas_path = generate_excel_report(self.rows, os.path.join(self.tmp_dir.name, "pandas.xlsx"))
+        self.assertEqual(self.read_back(fast_path), self.read_back(pandas_path))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.store import DocuScraperStore
+
+def make_document(doc_id, doc_class="passport", file_path=None):
+    """Build a document record as the API stores it"""
+    return {
+        "id": doc_id,
+        "doc_class": doc_class,
+        "title": f"Document {doc_id}",
+        "file_path": file_path or f"downloads/{doc_id}.pdf",
+        "file_type": ".pdf",
+        "file_size": 1024,
+        "timestamp": "20240101_120000"
+    }
+
+class TestDocuScraperStore(unittest.TestCase):
+    """Test cases for the SQLite job and document store"""
+
+    def setUp(self):
+        """Open a fresh in-memory store"""
+        self.store = DocuScraperStore(":memory:")
+
+    def tearDown(self):
+        """Close the store"""
+        self.store.close()
+
+    def test_job_round_trip(self):
+        """Test creating, updating and counting jobs"""
+        self.store.create_job({
+            "job_id": "job-1",
+            "doc_class": "passport",
+            "status": "running",
+            "start_time": "2024-01-01T12:00:00",
+            "completed": False
+        })
+        self.assertEqual(self.store.count_jobs(completed=False), 1)
+
+        self.store.update_job("job-1", status="completed", completed=True, documents_found=3)
+        job = self.store.get_job("job-1")
+        self.assertEqual(job["status"], "completed")
+        self.assertIs(job["completed"], True)
+        self.assertEqual(job["documents_found"], 3)
+        self.assertEqual(self.store.count_jobs(completed=True), 1)
+        self.assertEqual(self.store.count_jobs(completed=False), 0)
+
+    def test_update_job_rejects_unknown_fields(self):
+        """Test that updating an unknown job field raises ValueError"""
+        with self.assertRaises(ValueError):
+            self.store.update_job("job-1", bogus=1)
+
+    def test_get_missing(self):
+        """Test lookups of unknown IDs"""
+        self.assertIsNone(self.store.get_job("missing"))
+        self.assertIsNone(self.store.get_document("missing"))
+
+    def test_documents_filter_and_paging(self):
+        """Test listing documents by class with limit and offset"""
+        self.store.add_documents([
+            make_document("d1", "passport"),
+            make_document("d2", "utility_bill"),
+            make_document("d3", "passport"),
+            make_document("d4", "passport")
+        ])
+        self.assertEqual(self.store.count_documents(), 4)
+
+        passports = self.store.list_documents(doc_class="passport")
+        self.assertEqual([doc["id"] for doc in passports], ["d1", "d3", "d4"])
+
+        page = self.store.list_documents(doc_class="passport", limit=1, offset=1)
+        self.assertEqual([doc["id"] for doc in page], ["d3"])
+
+        document = self.store.get_document("d2")
+        self.assertEqual(document["doc_class"], "utility_bill")
+        self.assertEqual(document["download_url"], "/document/download/d2")
+
+    def test_delete_and_shared_file_path(self):
+        """Test that a file stays in use while another record points at it"""
+        shared_path = "downloads/shared.pdf"
+        self.store.add_documents([
+            make_document("d1", file_path=shared_path),
+            make_document("d2", file_path=shared_path)
+        ])
+
+        self.store.delete_document("d1")
+        self.assertIsNone(self.store.get_document("d1"))
+        self.assertTrue(self.store.file_path_in_use(shared_path))
+
+        self.store.delete_document("d2")
+        self.assertFalse(self.store.file_path_in_use(shared_path))
+        self.assertEqual(self.store.count_documents(), 0)
+
+    def test_reopen_fails_interrupted_jobs(self):
+        """Test that jobs left running by a previous process are closed out"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "docuscraper.db")
+            store = DocuScraperStore(db_path)
+            for job_id, status in (("queued", "queued"), ("searching", "searching")):
+                store.create_job({
+                    "job_id": job_id,
+                    "doc_class": "passport",
+                    "status": status,
+                    "start_time": "2024-01-01T12:00:00",
+                    "completed": False
+                })
+            store.create_job({
+                "job_id": "done",
+                "doc_class": "passport",
+                "status": "completed",
+                "start_time": "2024-01-01T12:00:00",
+                "completed": True
+            })
+            store.close()
+
+            store = DocuScraperStore(db_path)
+            try:
+                self.assertEqual(store.count_jobs(completed=False), 0)
+                for job_id in ("queued", "searching"):
+                    job = store.get_job(job_id)
+                    self.assertEqual(job["status"], "failed")
+                    self.assertIs(job["completed"], True)
+                    self.assertEqual(job["error"], "interrupted")
+
+                job = store.get_job("done")
+                self.assertEqual(job["status"], "completed")
+                self.assertIsNone(job["error"])
+            finally:
+                store.close()
+
+if __name__ == "__main__":
+    unittest.main()
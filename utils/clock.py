@@ -0,0 +1,24 @@
+import time
+from datetime import datetime
+
+# (second, iso_string) for the most recently formatted wall-clock second.
+# Stored as a single tuple so concurrent readers never see a torn update.
+_ts_cache = (0, "")
+
+def now_iso() -> str:
+    """
+    Get the current local time as an ISO 8601 string
+    
+    The string is formatted at most once per second and reused in between,
+    so hot paths avoid building a datetime for every call.
+    
+    Returns:
+        ISO 8601 timestamp with one second resolution
+    """
+    global _ts_cache
+    second = int(time.time())
+    cached_second, cached_value = _ts_cache
+    if second != cached_second:
+        cached_value = datetime.fromtimestamp(second).isoformat()
+        _ts_cache = (second, cached_value)
+    return cached_value
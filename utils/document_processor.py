@@ -5,6 +5,9 @@ from typing import Optional
 # Configure logging
 logger = logging.getLogger("document-processor")
 
+# Bytes of a text file fed to chardet when it is not UTF-8
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
 def extract_text_from_file(file_path: str) -> str:
     """
     Extract text from a document file.
@@ -46,14 +49,37 @@ def extract_text_from_file(file_path: str) -> str:
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF file"""
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        # Fall back to the pure-Python parser
+        return _extract_text_from_pdf_pypdf2(file_path)
+    
+    try:
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            parts = []
+            for page in pdf:
+                textpage = page.get_textpage()
+                # PDFium separates lines with CRLF
+                parts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+        
+        return "\n".join(parts) + "\n" if parts else ""
+    except Exception as e:
+        return f"[PDF Extraction Error: {str(e)}]"
+
+def _extract_text_from_pdf_pypdf2(file_path: str) -> str:
+    """Extract text from PDF file with PyPDF2"""
     try:
         from PyPDF2 import PdfReader
         
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        parts = [page.extract_text() for page in reader.pages]
+        return "\n".join(parts) + "\n" if parts else ""
     except ImportError:
         return f"[PDF Extraction Error: PyPDF2 not installed]"
     except Exception as e:
@@ -65,10 +91,8 @@ def extract_text_from_docx(file_path: str) -> str:
         import docx
         
         doc = docx.Document(file_path)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text
+        parts = [para.text for para in doc.paragraphs]
+        return "\n".join(parts) + "\n" if parts else ""
     except ImportError:
         return f"[DOCX Extraction Error: python-docx not installed]"
     except Exception as e:
@@ -79,14 +103,19 @@ def extract_text_from_xlsx(file_path: str) -> str:
     try:
         import openpyxl
         
-        workbook = openpyxl.load_workbook(file_path)
-        text = ""
-        for sheet in workbook.worksheets:
-            for row in sheet.iter_rows():
-                row_text = " ".join(str(cell.value) for cell in row if cell.value)
-                if row_text:
-                    text += row_text + "\n"
-        return text
+        # Stream cell values only; no Cell objects, styles or formulas
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            lines = []
+            for sheet in workbook.worksheets:
+                for row in sheet.iter_rows(values_only=True):
+                    row_text = " ".join(str(value) for value in row if value)
+                    if row_text:
+                        lines.append(row_text)
+        finally:
+            # Read-only workbooks keep the file open until closed
+            workbook.close()
+        return "\n".join(lines) + "\n" if lines else ""
     except ImportError:
         return f"[XLSX Extraction Error: openpyxl not installed]"
     except Exception as e:
@@ -101,10 +130,12 @@ def extract_text_from_txt(file_path: str) -> str:
         # Try different encodings
         try:
             import chardet
+            # A prefix is enough to detect the encoding
             with open(file_path, 'rb') as f:
-                raw_data = f.read()
-            encoding = chardet.detect(raw_data)['encoding']
-            with open(file_path, 'r', encoding=encoding) as f:
+                sample = f.read(ENCODING_SAMPLE_SIZE)
+            encoding = chardet.detect(sample)['encoding'] or 'utf-8'
+            # Bytes past the sample may not fit the detected encoding
+            with open(file_path, 'r', encoding=encoding, errors='replace') as f:
                 return f.read()
         except ImportError:
             # If chardet is not available, try with common encodings
@@ -1,17 +1,94 @@
 import os
 import logging
-from typing import Optional, List, Tuple
+import functools
+from typing import Optional, List, Sequence, Tuple
 
 # Configure logging
 logger = logging.getLogger("file-validator")
 
-def validate_file_type(file_path: str, expected_types: Optional[List[str]] = None) -> Tuple[bool, str]:
+# Map extensions to MIME types (used when python-magic is unavailable)
+EXT_TO_MIME = {
+    '.pdf': 'application/pdf',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.doc': 'application/msword',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.xls': 'application/vnd.ms-excel',
+    '.txt': 'text/plain',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png'
+}
+
+# Leading bytes ("magic numbers") that files of each extension start with
+FILE_SIGNATURES = {
+    '.pdf': (b'%PDF-',),
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.jpg': (b'\xff\xd8\xff',),
+    '.jpeg': (b'\xff\xd8\xff',),
+    '.docx': (b'PK\x03\x04',),
+    '.xlsx': (b'PK\x03\x04',),
+    '.doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    '.xls': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',)
+}
+
+# Extensions whose signature alone identifies the type, so a file with a
+# matching header does not need a full libmagic sniff
+_TRUSTED_EXTS = frozenset({'.pdf', '.png', '.jpg', '.jpeg'})
+
+# Response content types that are never a document (error pages, API replies)
+_REJECTED_CONTENT_TYPES = frozenset({
+    'text/html', 'application/xhtml+xml', 'application/json'
+})
+
+# Content types servers send when they do not name the actual type
+_GENERIC_CONTENT_TYPES = frozenset({
+    '', 'application/octet-stream', 'binary/octet-stream',
+    'application/download', 'application/force-download'
+})
+
+# Non-standard content types servers commonly declare for each extension,
+# accepted by the response header check alongside the expected types
+_ZIP_CONTENT_TYPES = frozenset({'application/zip', 'application/x-zip-compressed'})
+_CONTENT_TYPE_ALIASES = {
+    '.pdf': frozenset({'application/x-pdf', 'application/acrobat', 'text/pdf', 'text/x-pdf'}),
+    '.docx': _ZIP_CONTENT_TYPES,
+    '.xlsx': _ZIP_CONTENT_TYPES,
+    '.doc': frozenset({'application/vnd.ms-word', 'application/doc', 'application/x-msword'}),
+    '.xls': frozenset({'application/x-msexcel', 'application/x-excel', 'application/x-ms-excel'}),
+    '.jpg': frozenset({'image/jpg', 'image/pjpeg'}),
+    '.jpeg': frozenset({'image/jpg', 'image/pjpeg'}),
+    '.png': frozenset({'image/x-png'})
+}
+
+# Shared libmagic MIME detector, created once because loading its database
+# is expensive. None if python-magic is not installed; callers then fall back
+# to extension checks without retrying the import on every call.
+try:
+    import magic
+    _MIME = magic.Magic(mime=True)
+except ImportError:
+    logger.warning("python-magic not installed. Using basic extension check.")
+    _MIME = None
+
+def _is_expected_type(detected_type: str, expected_types: Optional[Sequence[str]]) -> bool:
+    """Check a detected MIME type against full expected MIME type strings"""
+    # No expected types means any type is accepted
+    return not expected_types or detected_type in expected_types
+
+def validate_file_type(
+    file_path: str,
+    expected_types: Optional[Sequence[str]] = None,
+    deep: bool = True
+) -> Tuple[bool, str]:
     """
     Validate file type using python-magic
     
     Args:
         file_path: Path to the file
         expected_types: List of expected MIME types (optional)
+        deep: Sniff the file with libmagic even when its extension is
+            trusted. Pass False only after check_file_signature has
+            confirmed the header.
         
     Returns:
         Tuple of (is_valid, detected_mime_type)
@@ -20,61 +97,89 @@ def validate_file_type(file_path: str, expected_types: Optional[List[str]] = Non
         logger.error(f"File not found: {file_path}")
         return False, "File not found"
     
+    _, file_ext = os.path.splitext(file_path)
+    file_ext = file_ext.lower()
+    
+    if _MIME is None or (not deep and file_ext in _TRUSTED_EXTS):
+        # Fallback to basic extension check
+        detected_type = EXT_TO_MIME.get(file_ext, 'application/octet-stream')
+        return _is_expected_type(detected_type, expected_types), detected_type
+    
     try:
-        import magic
-        mime = magic.Magic(mime=True)
-        detected_type = mime.from_file(file_path)
+        detected_type = _MIME.from_file(file_path)
         
         logger.info(f"Detected MIME type for {file_path}: {detected_type}")
         
-        # If no expected types provided, just return the detected type
-        if not expected_types:
+        if _is_expected_type(detected_type, expected_types):
             return True, detected_type
-        
-        # Check if detected type matches any expected type
-        for expected_type in expected_types:
-            if expected_type in detected_type:
-                return True, detected_type
                 
         logger.warning(f"File type mismatch for {file_path}. Expected: {expected_types}, Got: {detected_type}")
         return False, detected_type
         
-    except ImportError:
-        logger.warning("python-magic not installed. Using basic extension check.")
-        # Fallback to basic extension check
-        _, file_ext = os.path.splitext(file_path)
-        file_ext = file_ext.lower()
-        
-        # Map extensions to MIME types
-        ext_to_mime = {
-            '.pdf': 'application/pdf',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.doc': 'application/msword',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.xls': 'application/vnd.ms-excel',
-            '.txt': 'text/plain',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png'
-        }
-        
-        detected_type = ext_to_mime.get(file_ext, 'application/octet-stream')
-        
-        if not expected_types:
-            return True, detected_type
-            
-        for expected_type in expected_types:
-            if expected_type in detected_type:
-                return True, detected_type
-                
-        return False, detected_type
-        
     except Exception as e:
         logger.error(f"Error validating file type: {str(e)}")
         return False, f"Error: {str(e)}"
 
-def get_expected_mime_types(file_ext: str) -> List[str]:
-    """Get expected MIME types for a file extension"""
+def check_file_signature(file_path: str, file_ext: str) -> Optional[bool]:
+    """
+    Check a file's leading bytes against the signature for its extension
+    
+    Args:
+        file_path: Path to the file
+        file_ext: File extension (e.g., ".pdf")
+        
+    Returns:
+        True if the signature matches, False if it does not, or None if
+        the extension has no known signature
+    """
+    signatures = FILE_SIGNATURES.get(file_ext.lower())
+    if not signatures:
+        return None
+    
+    with open(file_path, 'rb') as f:
+        header = f.read(16)
+    return header.startswith(signatures)
+
+def check_response_headers(
+    content_type: Optional[str],
+    content_length: Optional[str],
+    file_ext: str,
+    max_size: Optional[int] = None
+) -> Tuple[bool, str]:
+    """
+    Check a download's response headers before its body is transferred
+    
+    Args:
+        content_type: Content-Type header value (may include parameters)
+        content_length: Content-Length header value
+        file_ext: File extension the document is expected to have
+        max_size: Maximum accepted size in bytes (optional)
+        
+    Returns:
+        Tuple of (is_acceptable, reason); reason is empty when acceptable
+    """
+    mime_type = (content_type or "").split(";", 1)[0].strip().lower()
+    if mime_type in _REJECTED_CONTENT_TYPES:
+        return False, f"Unexpected content type: {mime_type}"
+    
+    expected_types = get_expected_mime_types(file_ext)
+    if (
+        expected_types
+        and mime_type not in _GENERIC_CONTENT_TYPES
+        and mime_type not in expected_types
+        and mime_type not in _CONTENT_TYPE_ALIASES.get(file_ext.lower(), ())
+    ):
+        return False, f"Unexpected content type for {file_ext}: {mime_type}"
+    
+    if max_size is not None and content_length and content_length.isdigit():
+        if int(content_length) > max_size:
+            return False, f"File too large: {content_length} bytes"
+    
+    return True, ""
+
+@functools.lru_cache(maxsize=32)
+def get_expected_mime_types(file_ext: str) -> Tuple[str, ...]:
+    """Get expected MIME types for a file extension (cached, immutable)"""
     ext_to_mime = {
         '.pdf': ['application/pdf'],
         '.docx': ['application/vnd.openxmlformats-officedocument.wordprocessingml.document'],
@@ -87,4 +192,56 @@ def get_expected_mime_types(file_ext: str) -> List[str]:
         '.png': ['image/png']
     }
     
-    return ext_to_mime.get(file_ext.lower(), [])
\ No newline at end of file
+    return tuple(ext_to_mime.get(file_ext.lower(), ()))
+
+def validate_file_buffer(
+    buffer: bytes,
+    expected_types: Optional[Sequence[str]] = None,
+    file_ext: str = ""
+) -> Tuple[bool, str]:
+    """
+    Validate file type from the leading bytes of a file using python-magic
+    
+    Lets downloaders sniff the type from data they already hold in memory
+    instead of reading the file back from disk.
+    
+    Args:
+        buffer: Leading bytes of the file (a few KB is enough)
+        expected_types: List of expected MIME types (optional)
+        file_ext: File extension, used when python-magic is not installed
+        
+    Returns:
+        Tuple of (is_valid, detected_mime_type)
+    """
+    if _MIME is None:
+        detected_type = EXT_TO_MIME.get(file_ext.lower(), 'application/octet-stream')
+    else:
+        try:
+            detected_type = _MIME.from_buffer(buffer)
+        except Exception as e:
+            logger.error(f"Error validating file type: {str(e)}")
+            return False, f"Error: {str(e)}"
+    
+    if _is_expected_type(detected_type, expected_types):
+        return True, detected_type
+    
+    logger.warning(f"File type mismatch. Expected: {expected_types}, Got: {detected_type}")
+    return False, detected_type
+
+def validate_documents_batch(
+    file_paths: List[str],
+    expected_types: Optional[Sequence[str]] = None
+) -> List[Tuple[bool, str]]:
+    """
+    Validate the file types of several files with a single libmagic detector
+    
+    Args:
+        file_paths: Paths to the files
+        expected_types: List of expected MIME types (optional)
+        
+    Returns:
+        List of (is_valid, detected_mime_type) tuples, in input order
+    """
+    # python-magic serializes calls on the shared detector with a lock, so a
+    # thread pool would not overlap anything; a plain loop is just as fast
+    return [validate_file_type(file_path, expected_types) for file_path in file_paths]
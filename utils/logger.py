@@ -1,9 +1,39 @@
 import os
+import time
+import queue
+import atexit
 import logging
+import threading
 import json
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize to a JSON string with orjson"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
+
+# Rotate log files at 10 MB, keeping 5 old files
+LOG_MAX_BYTES = 10_000_000
+LOG_BACKUP_COUNT = 5
+
+# One background listener per logger name, each writing that name's log file
+_listeners: Dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+# Standard LogRecord attributes that are not copied into JSON log lines
+_RESERVED = frozenset({
+    "args", "exc_info", "exc_text", "msg", "message",
+    "levelname", "levelno", "pathname", "filename",
+    "module", "name", "lineno", "funcName", "created",
+    "asctime", "msecs", "relativeCreated", "thread",
+    "threadName", "processName", "process"
+})
+
 class DocuScraperLogger:
     """
     Custom logger for DocuScraper application
@@ -39,49 +69,17 @@ class DocuScraperLogger:
         if self.logger.handlers:
             self.logger.handlers.clear()
         
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(console_level)
-        console_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        console_handler.setFormatter(console_format)
-        self.logger.addHandler(console_handler)
-        
-        # Create file handler
-        log_file = os.path.join(log_dir, f"{name}.log")
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(file_level)
+        # Log calls only enqueue the record; a background thread does the
+        # console and file writes
+        listener = _get_listener(name, log_dir, console_level, file_level, json_logging)
+        self.logger.addHandler(QueueHandler(listener.queue))
         
-        if json_logging:
-            file_handler.setFormatter(JsonFormatter())
-        else:
-            file_format = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(file_format)
-            
-        self.logger.addHandler(file_handler)
-    
-    def debug(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        """Log debug message"""
-        self.logger.debug(message, extra=extra)
-    
-    def info(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        """Log info message"""
-        self.logger.info(message, extra=extra)
-    
-    def warning(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        """Log warning message"""
-        self.logger.warning(message, extra=extra)
-    
-    def error(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        """Log error message"""
-        self.logger.error(message, extra=extra)
-    
-    def critical(self, message: str, extra: Optional[Dict[str, Any]] = None):
-        """Log critical message"""
-        self.logger.critical(message, extra=extra)
+        # Expose the logging methods directly; they take extra= as a keyword
+        self.debug = self.logger.debug
+        self.info = self.logger.info
+        self.warning = self.logger.warning
+        self.error = self.logger.error
+        self.critical = self.logger.critical
     
     def log_document_search(
         self, 
@@ -164,32 +162,96 @@ class DocuScraperLogger:
         self.info(f"API {method} {endpoint}: {status_code}", extra=extra)
 
 
+def _get_listener(
+    name: str,
+    log_dir: str,
+    console_level: int,
+    file_level: int,
+    json_logging: bool
+) -> QueueListener:
+    """
+    Get the queue listener for a logger name, starting it on first use
+    
+    Later loggers with the same name share the listener, and with it the
+    handler settings of the first one.
+    
+    Args:
+        name: Logger name, also used for the log file name
+        log_dir: Directory for the log file
+        console_level: Minimum level written to the console
+        file_level: Minimum level written to the log file
+        json_logging: Write the log file as JSON lines
+        
+    Returns:
+        Running QueueListener
+    """
+    with _listeners_lock:
+        listener = _listeners.get(name)
+        if listener is not None:
+            return listener
+        
+        # Create console handler
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(console_level)
+        console_format = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        console_handler.setFormatter(console_format)
+        
+        # Create file handler
+        log_file = os.path.join(log_dir, f"{name}.log")
+        file_handler = RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT
+        )
+        file_handler.setLevel(file_level)
+        
+        if json_logging:
+            file_handler.setFormatter(JsonFormatter())
+        else:
+            file_format = logging.Formatter(
+                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            )
+            file_handler.setFormatter(file_format)
+        
+        listener = QueueListener(
+            queue.Queue(-1), console_handler, file_handler, respect_handler_level=True
+        )
+        listener.start()
+        _listeners[name] = listener
+        return listener
+
+
+def _stop_listeners():
+    """Flush queued records and stop all listeners"""
+    with _listeners_lock:
+        for listener in _listeners.values():
+            listener.stop()
+        _listeners.clear()
+
+
+atexit.register(_stop_listeners)
+
+
 class JsonFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
     def format(self, record):
         """Format log record as JSON"""
         log_data = {
-            "timestamp": datetime.now().isoformat(),
+            # UTC, from the creation time the record already carries
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+                + f".{int(record.msecs):03d}Z",
             "name": record.name,
             "level": record.levelname,
             "message": record.getMessage()
         }
         
-        # Add extra fields if available
-        if hasattr(record, "operation"):
-            log_data["operation"] = record.operation
-            
         # Add all extra fields
         for key, value in record.__dict__.items():
-            if key not in ["args", "exc_info", "exc_text", "msg", "message", 
-                          "levelname", "levelno", "pathname", "filename", 
-                          "module", "name", "lineno", "funcName", "created", 
-                          "asctime", "msecs", "relativeCreated", "thread", 
-                          "threadName", "processName", "process"]:
+            if key not in _RESERVED:
                 log_data[key] = value
                 
-        return json.dumps(log_data)
+        return _dumps(log_data)
 
 
 # Example usage
@@ -199,8 +261,8 @@ if __name__ == "__main__":
     
     # Log some messages
     logger.info("Application started")
-    logger.warning("This is a warning", {"source": "test"})
-    logger.error("This is an error", {"error_code": 500})
+    logger.warning("This is a warning", extra={"source": "test"})
+    logger.error("This is an error", extra={"error_code": 500})
     
     # Log document operations
     logger.log_document_search("invoice", "invoice template", 5, 1200)
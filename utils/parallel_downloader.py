@@ -1,22 +1,30 @@
 import os
 import time
+import asyncio
 import hashlib
-import requests
-import concurrent.futures
-from datetime import datetime
+import aiohttp
+import aiofiles
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 from utils.logger import DocuScraperLogger
-from utils.file_validator import validate_file_type
+from utils.file_validator import validate_file_buffer, check_response_headers
+from utils.clock import now_iso
 
 # Initialize logger
 logger = DocuScraperLogger("parallel-downloader")
 
+# Bytes read from the response and written per loop iteration
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Leading bytes kept from each download for MIME type detection
+SNIFF_SIZE = 4096
+
 def download_documents_parallel(
     search_results: List[Dict[str, Any]], 
     max_workers: int = 5,
-    timeout: int = 30
+    timeout: int = 30,
+    max_file_size: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Download multiple documents in parallel
@@ -25,6 +33,7 @@ def download_documents_parallel(
         search_results: List of search results containing document URLs
         max_workers: Maximum number of parallel downloads
         timeout: Download timeout in seconds
+        max_file_size: Reject downloads announcing a larger Content-Length (optional)
         
     Returns:
         List of document metadata for successfully downloaded documents
@@ -35,41 +44,67 @@ def download_documents_parallel(
     logger.info(f"Starting parallel download of {len(search_results)} documents with {max_workers} workers")
     start_time = time.time()
     
-    # Create a thread pool
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit download tasks
-        future_to_result = {
-            executor.submit(download_single_document, result, timeout): result 
-            for result in search_results
-        }
-        
-        # Collect results as they complete
-        documents = []
-        for future in concurrent.futures.as_completed(future_to_result):
-            result = future_to_result[future]
-            try:
-                document = future.result()
-                if document:
-                    documents.append(document)
-            except Exception as e:
-                url = result.get("url", "unknown")
-                logger.error(f"Error downloading document {url}: {str(e)}")
+    # Create each class directory once up front rather than per download
+    for doc_class in {result.get("doc_class", "unknown") for result in search_results}:
+        Path(f"data/raw_docs/{doc_class}").mkdir(parents=True, exist_ok=True)
+    
+    documents = asyncio.run(_run_all(search_results, max_workers, timeout, max_file_size))
     
     duration_ms = int((time.time() - start_time) * 1000)
     logger.info(f"Parallel download completed in {duration_ms}ms. Downloaded {len(documents)}/{len(search_results)} documents")
     
     return documents
 
-def download_single_document(
+async def _run_all(
+    search_results: List[Dict[str, Any]],
+    limit: int,
+    timeout: int,
+    max_file_size: Optional[int]
+) -> List[Dict[str, Any]]:
+    """
+    Download all documents on one event loop with a shared connection pool
+    
+    Args:
+        search_results: List of search results containing document URLs
+        limit: Maximum number of simultaneous connections
+        timeout: Download timeout in seconds
+        max_file_size: Reject downloads announcing a larger Content-Length
+        
+    Returns:
+        List of document metadata for successfully downloaded documents
+    """
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=8)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        results = await asyncio.gather(
+            *[_download_one(session, result, timeout, max_file_size) for result in search_results],
+            return_exceptions=True
+        )
+    
+    # Collect successful downloads
+    documents = []
+    for result, document in zip(search_results, results):
+        if isinstance(document, BaseException):
+            url = result.get("url", "unknown")
+            logger.error(f"Error downloading document {url}: {str(document)}")
+        elif document:
+            documents.append(document)
+    
+    return documents
+
+async def _download_one(
+    session: aiohttp.ClientSession,
     search_result: Dict[str, Any],
-    timeout: int = 30
+    timeout: int = 30,
+    max_file_size: Optional[int] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Download a single document from URL and save to local storage
     
     Args:
+        session: Shared aiohttp client session
         search_result: Search result containing document URL
-        timeout: Download timeout in seconds
+        timeout: Connect and per-read timeout in seconds
+        max_file_size: Reject downloads announcing a larger Content-Length (optional)
         
     Returns:
         Document metadata if download successful, None otherwise
@@ -82,28 +117,47 @@ def download_single_document(
         return None
     
     try:
-        # Create file path from URL
-        url_hash = hashlib.md5(url.encode()).hexdigest()
+        # Create file path from URL; same naming as agents.doc_agent so a
+        # URL maps to one file whichever downloader fetched it
+        url_hash = hashlib.blake2b(url.encode("utf-8"), digest_size=10).hexdigest()
         file_ext = os.path.splitext(url)[1].lower()
         if not file_ext:
             file_ext = ".pdf"  # Default to PDF if no extension
-            
-        # Create directory structure
-        doc_dir = Path(f"data/raw_docs/{doc_class}")
-        doc_dir.mkdir(parents=True, exist_ok=True)
-        
-        file_path = doc_dir / f"{url_hash}{file_ext}"
         
-        # Download the file
-        response = requests.get(url, stream=True, timeout=timeout)
-        response.raise_for_status()
+        # Directory created by download_documents_parallel
+        file_path = Path(f"data/raw_docs/{doc_class}") / f"{url_hash}{file_ext}"
         
-        with open(file_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        # Download the file, hashing, sizing and keeping the leading bytes
+        # for MIME sniffing in the same pass so it is never read back
+        content_hash = hashlib.blake2b(digest_size=16)
+        file_size = 0
+        head = b""
+        # Per connect/read timeouts like the sequential downloader, so
+        # large files on slow links aren't cut off mid-body
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+        async with session.get(url, timeout=client_timeout) as response:
+            response.raise_for_status()
+            
+            # Bail out on error pages and oversized files before the body
+            is_acceptable, reason = check_response_headers(
+                response.headers.get("Content-Type"),
+                response.headers.get("Content-Length"),
+                file_ext,
+                max_file_size
+            )
+            if not is_acceptable:
+                raise ValueError(reason)
+            
+            async with aiofiles.open(file_path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+                    content_hash.update(chunk)
+                    file_size += len(chunk)
+                    if len(head) < SNIFF_SIZE:
+                        head += chunk[:SNIFF_SIZE - len(head)]
         
         # Validate file type
-        is_valid_type, detected_type = validate_file_type(str(file_path))
+        is_valid_type, detected_type = validate_file_buffer(head, file_ext=file_ext)
         
         # Create document metadata
         document = {
@@ -112,9 +166,10 @@ def download_single_document(
             "url": url,
             "file_path": str(file_path),
             "file_type": file_ext,
-            "file_size": os.path.getsize(file_path),
+            "file_size": file_size,
             "mime_type": detected_type,
-            "timestamp": datetime.now().isoformat(),
+            "content_hash": content_hash.hexdigest(),
+            "timestamp": now_iso(),
             "download_successful": True,
             "validated": False
         }
@@ -136,4 +191,4 @@ def download_single_document(
             success=False,
             error=error_msg
         )
-        return None
\ No newline at end of file
+        return None
@@ -1,14 +1,119 @@
+import io
 import os
-import pandas as pd
-from typing import List, Dict, Any, Optional
+import csv
+import re
+import functools
+import zipfile
+from typing import TYPE_CHECKING, Iterable, List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
+from xml.sax.saxutils import escape
 
 from utils.logger import DocuScraperLogger
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 # Initialize logger
 logger = DocuScraperLogger("report-generator")
 
+# Report columns and the document field (with default) each is read from
+REPORT_COLUMNS = (
+    "Document Class", "Title", "URL", "File Path", "File Type",
+    "File Size (bytes)", "Downloaded", "Validated", "Timestamp"
+)
+_REPORT_FIELDS = (
+    ("doc_class", "Unknown"),
+    ("title", "Untitled"),
+    ("url", ""),
+    ("file_path", ""),
+    ("file_type", ""),
+    ("file_size", 0),
+    ("download_successful", False),
+    ("validated", False),
+    ("timestamp", "")
+)
+_SIZE_INDEX = REPORT_COLUMNS.index("File Size (bytes)")
+
+# Reports with at least this many rows skip pandas and write the XLSX directly
+LARGE_REPORT_ROWS = 5000
+
+# Default location for generated reports
+_REPORTS_DIR = Path("data/reports")
+
+# File extension of each report format; other formats produce text reports
+_REPORT_EXTENSIONS = {
+    "excel": ".xlsx",
+    "csv": ".csv",
+    "parquet": ".parquet"
+}
+
+# Text report block for one document, filled with a row's values
+_TEXT_ROW_TEMPLATE = "".join(f"{column}: {{}}\n" for column in REPORT_COLUMNS) + "\n"
+
+# Write buffer for report files; reports are large sequential writes
+REPORT_BUFFER_SIZE = 1 << 20
+
+# Fixed parts of a minimal single-sheet XLSX package
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Documents" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_XLSX_SHEET_END = '</sheetData></worksheet>'
+_XLSX_SST_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'count="{count}" uniqueCount="{unique}">'
+)
+_XLSX_SST_END = '</sst>'
+
+# Control characters that are not allowed in XML 1.0
+_XML_ILLEGAL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
 def generate_report(
     documents: List[Dict[str, Any]], 
     output_format: str = "excel", 
@@ -19,7 +124,7 @@ def generate_report(
     
     Args:
         documents: List of document metadata
-        output_format: Format of the report ('excel' or 'text')
+        output_format: Format of the report ('excel', 'csv', 'parquet' or 'text')
         output_path: Path to save the report (optional)
         
     Returns:
@@ -29,78 +134,241 @@ def generate_report(
         logger.warning("No documents to generate report")
         return ""
     
-    # Create reports directory if it doesn't exist
-    reports_dir = Path("data/reports")
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Generate timestamp for filename
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
     # Determine output path
+    output_format = output_format.lower()
     if not output_path:
-        if output_format.lower() == "excel":
-            output_path = str(reports_dir / f"document_report_{timestamp}.xlsx")
-        else:
-            output_path = str(reports_dir / f"document_report_{timestamp}.txt")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        extension = _REPORT_EXTENSIONS.get(output_format, ".txt")
+        output_path = str(_reports_dir() / f"document_report_{timestamp}{extension}")
     
     try:
-        # Extract relevant fields for the report
-        report_data = []
-        for doc in documents:
-            report_data.append({
-                "Document Class": doc.get("doc_class", "Unknown"),
-                "Title": doc.get("title", "Untitled"),
-                "URL": doc.get("url", ""),
-                "File Path": doc.get("file_path", ""),
-                "File Type": doc.get("file_type", ""),
-                "File Size (bytes)": doc.get("file_size", 0),
-                "Downloaded": doc.get("download_successful", False),
-                "Validated": doc.get("validated", False),
-                "Timestamp": doc.get("timestamp", "")
-            })
+        # Extract relevant fields for the report, one tuple per document in
+        # REPORT_COLUMNS order. Streaming writers consume them as they are
+        # built, so documents are only walked once.
+        rows = (_report_row(doc) for doc in documents)
         
         # Generate report based on format
-        if output_format.lower() == "excel":
-            return generate_excel_report(report_data, output_path)
+        if output_format == "excel":
+            rows = list(rows)
+            if len(rows) >= LARGE_REPORT_ROWS:
+                return generate_excel_report_fast(rows, output_path)
+            return generate_excel_report(rows, output_path)
+        elif output_format == "csv":
+            return generate_csv_report(rows, output_path)
+        elif output_format == "parquet":
+            return generate_parquet_report(list(rows), output_path)
         else:
-            return generate_text_report(report_data, output_path)
+            return generate_text_report(rows, output_path)
             
-    except Exception as e:
-        logger.error(f"Error generating report: {str(e)}")
+    except Exception:
+        logger.error("Error generating report", exc_info=True)
         return ""
 
-def generate_excel_report(report_data: List[Dict[str, Any]], output_path: str) -> str:
-    """Generate Excel report"""
+def _report_row(doc: Dict[str, Any]) -> Tuple:
+    """
+    Build one report row, in REPORT_COLUMNS order, from a document
+    
+    Missing and None fields both take the field default, and the file size
+    is coerced to an int, so every writer sees the same values.
+    
+    Args:
+        doc: Document dictionary
+        
+    Returns:
+        Tuple of report cell values
+    """
+    row = []
+    for key, default in _REPORT_FIELDS:
+        value = doc.get(key)
+        row.append(default if value is None else value)
+    
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame(report_data)
+        row[_SIZE_INDEX] = int(row[_SIZE_INDEX])
+    except (TypeError, ValueError):
+        row[_SIZE_INDEX] = 0
+    return tuple(row)
+
+@functools.lru_cache(maxsize=None)
+def _reports_dir() -> Path:
+    """Create the default reports directory, once per process"""
+    _REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    return _REPORTS_DIR
+
+def _report_frame(rows: List[Tuple]) -> "pd.DataFrame":
+    """
+    Build the report DataFrame with explicit column dtypes
+    
+    Without explicit dtypes pandas infers object columns, which it then
+    scans and trims when writing.
+    
+    Args:
+        rows: Report rows in REPORT_COLUMNS order
         
+    Returns:
+        DataFrame with int64 size, bool flag and str text columns
+    """
+    # Imported here so CSV, text and large Excel reports never load pandas
+    import pandas as pd
+    
+    df = pd.DataFrame.from_records(rows, columns=REPORT_COLUMNS)
+    
+    size_col = "File Size (bytes)"
+    df[size_col] = pd.to_numeric(df[size_col], errors="coerce").fillna(0).astype("int64")
+    for flag_col in ("Downloaded", "Validated"):
+        df[flag_col] = df[flag_col].fillna(False).astype(bool)
+    
+    text_cols = [col for col in REPORT_COLUMNS if col not in (size_col, "Downloaded", "Validated")]
+    df[text_cols] = df[text_cols].fillna("").astype(str)
+    return df
+
+def generate_excel_report(rows: List[Tuple], output_path: str) -> str:
+    """Generate Excel report from rows in REPORT_COLUMNS order"""
+    df = _report_frame(rows)
+    
+    try:
         # Write to Excel
-        df.to_excel(output_path, index=False, sheet_name="Documents")
+        # xlsxwriter is a faster write-only engine than the openpyxl default
+        df.to_excel(output_path, index=False, sheet_name="Documents", engine="xlsxwriter")
         
         logger.info(f"Excel report generated: {output_path}")
         return output_path
-    except Exception as e:
-        logger.error(f"Error generating Excel report: {str(e)}")
+    except Exception:
+        logger.error("Error generating Excel report", exc_info=True)
+        return ""
+
+def generate_excel_report_fast(rows: List[Tuple], output_path: str) -> str:
+    """
+    Generate Excel report by writing the XLSX package directly
+    
+    The report schema is fixed and holds only primitive values, so rows are
+    streamed as sheet XML instead of going through a DataFrame and an Excel
+    engine. Strings go into a shared-strings table, so the few distinct
+    classes, file types and timestamps are stored once.
+    
+    Args:
+        rows: Report rows in REPORT_COLUMNS order
+        output_path: Path to save the report
+        
+    Returns:
+        Path to the generated report
+    """
+    try:
+        # String -> shared string index, in first-seen order
+        shared_strings: Dict[str, int] = {}
+        
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+            zf.writestr('_rels/.rels', _XLSX_ROOT_RELS)
+            zf.writestr('xl/workbook.xml', _XLSX_WORKBOOK)
+            zf.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+            zf.writestr('xl/styles.xml', _XLSX_STYLES)
+            
+            string_count = 0
+            # Zip entry streams are unbuffered; batch the per-row writes
+            with io.BufferedWriter(zf.open('xl/worksheets/sheet1.xml', 'w'), REPORT_BUFFER_SIZE) as sheet:
+                sheet.write(_XLSX_SHEET_START.encode('utf-8'))
+                row_xml, count = _xlsx_row(1, REPORT_COLUMNS, shared_strings)
+                sheet.write(row_xml.encode('utf-8'))
+                string_count += count
+                for row_number, row in enumerate(rows, 2):
+                    row_xml, count = _xlsx_row(row_number, row, shared_strings)
+                    sheet.write(row_xml.encode('utf-8'))
+                    string_count += count
+                sheet.write(_XLSX_SHEET_END.encode('utf-8'))
+            
+            with io.BufferedWriter(zf.open('xl/sharedStrings.xml', 'w'), REPORT_BUFFER_SIZE) as sst:
+                sst.write(_XLSX_SST_START.format(
+                    count=string_count, unique=len(shared_strings)
+                ).encode('utf-8'))
+                for text in shared_strings:
+                    sst.write(f'<si><t xml:space="preserve">{escape(text)}</t></si>'.encode('utf-8'))
+                sst.write(_XLSX_SST_END.encode('utf-8'))
+        
+        logger.info(f"Excel report generated: {output_path}")
+        return output_path
+    except Exception:
+        logger.error("Error generating Excel report", exc_info=True)
+        return ""
+
+def _xlsx_row(row_number: int, values, shared_strings: Dict[str, int]) -> Tuple[str, int]:
+    """
+    Build the sheet XML for one row of cell values
+    
+    Args:
+        row_number: 1-based row number
+        values: Cell values in column order
+        shared_strings: Shared strings table, extended with new strings
+        
+    Returns:
+        Tuple of (row_xml, number_of_string_cells)
+    """
+    cells = []
+    string_count = 0
+    for value in values:
+        if value is None or value == "":
+            cells.append('<c/>')
+        elif isinstance(value, bool):
+            cells.append(f'<c t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, (int, float)):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            text = _XML_ILLEGAL_CHARS.sub('', str(value))
+            index = shared_strings.setdefault(text, len(shared_strings))
+            cells.append(f'<c t="s"><v>{index}</v></c>')
+            string_count += 1
+    return f'<row r="{row_number}">{"".join(cells)}</row>', string_count
+
+def generate_csv_report(rows: Iterable[Tuple], output_path: str) -> str:
+    """Generate CSV report from rows in REPORT_COLUMNS order"""
+    try:
+        with open(output_path, 'w', encoding='utf-8', newline='', buffering=REPORT_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(REPORT_COLUMNS)
+            writer.writerows(rows)
+        
+        logger.info(f"CSV report generated: {output_path}")
+        return output_path
+    except Exception:
+        logger.error("Error generating CSV report", exc_info=True)
+        return ""
+
+def generate_parquet_report(rows: List[Tuple], output_path: str) -> str:
+    """Generate Parquet report from rows in REPORT_COLUMNS order"""
+    df = _report_frame(rows)
+    
+    # Smallest fitting types; categoricals are dictionary-encoded on disk
+    size_col = "File Size (bytes)"
+    if df[size_col].between(0, 2**31 - 1).all():
+        df[size_col] = df[size_col].astype("int32")
+    for category_col in ("Document Class", "File Type"):
+        df[category_col] = df[category_col].astype("category")
+    
+    try:
+        df.to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
+        
+        logger.info(f"Parquet report generated: {output_path}")
+        return output_path
+    except Exception:
+        logger.error("Error generating Parquet report", exc_info=True)
         return ""
 
-def generate_text_report(report_data: List[Dict[str, Any]], output_path: str) -> str:
-    """Generate text report"""
+def generate_text_report(rows: Iterable[Tuple], output_path: str) -> str:
+    """Generate text report from rows in REPORT_COLUMNS order"""
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write("DOCUMENT REPORT\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("=" * 80 + "\n\n")
+        with open(output_path, 'w', encoding='utf-8', buffering=REPORT_BUFFER_SIZE) as f:
+            f.write(
+                "DOCUMENT REPORT\n"
+                f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                + "=" * 80 + "\n\n"
+            )
             
-            for i, doc in enumerate(report_data, 1):
-                f.write(f"Document #{i}\n")
-                f.write("-" * 40 + "\n")
-                for key, value in doc.items():
-                    f.write(f"{key}: {value}\n")
-                f.write("\n")
+            # One write per document block
+            sep = "-" * 40 + "\n"
+            for i, row in enumerate(rows, 1):
+                f.write(f"Document #{i}\n{sep}" + _TEXT_ROW_TEMPLATE.format(*row))
         
         logger.info(f"Text report generated: {output_path}")
         return output_path
-    except Exception as e:
-        logger.error(f"Error generating text report: {str(e)}")
+    except Exception:
+        logger.error("Error generating text report", exc_info=True)
         return ""
\ No newline at end of file